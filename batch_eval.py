@@ -0,0 +1,101 @@
+"""
+Vectorized leaf evaluation. Positions are encoded as int8 rows of 64 squares
+(0 empty, 1..6 white pawn..king, negative for black) and a whole batch is scored
+with one gather against the stacked material + piece-square tables and a sum.
+
+NumPy is optional: without it HAS_NUMPY is False and the AI evaluates per piece.
+The search only uses the batch when ChessAI is built with batch_eval=True and
+without the running score or quiescence.
+
+Offline analysis of saved games: python batch_eval.py [saved_game.pkl ...]
+"""
+import pickle
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bitboard import PIECE_TYPES
+from position import Position
+
+HAS_NUMPY = np is not None
+
+# piece type -> square code for white, black uses the negative
+PIECE_CODES = {piece_type: code for code, piece_type in enumerate(PIECE_TYPES, 1)}
+# row of the stacked table holding the empty square
+EMPTY_ROW = len(PIECE_TYPES)
+
+
+def encode_position(position):
+    codes = np.zeros(64, dtype=np.int8)
+    for square, piece in enumerate(position.squares):
+        if piece is not None:
+            code = PIECE_CODES[piece.type]
+            codes[square] = code if piece.color == 'white' else -code
+    return codes
+
+
+def encode_children(codes, moves):
+    # one row per move: the parent position with that move played, promotions become queens
+    batch = np.repeat(codes[np.newaxis], len(moves), axis=0)
+    rows = np.arange(len(moves))
+    from_squares = np.empty(len(moves), dtype=np.intp)
+    to_squares = np.empty(len(moves), dtype=np.intp)
+    for index, (piece, (row, col)) in enumerate(moves):
+        from_row, from_col = piece.position
+        from_squares[index] = from_row * 8 + from_col
+        to_squares[index] = row * 8 + col
+    moved = batch[rows, from_squares]
+    promotion_row = np.where(moved > 0, 7, 0)
+    promoted = (np.abs(moved) == PIECE_CODES['pawn']) & (to_squares >> 3 == promotion_row)
+    batch[rows, to_squares] = np.where(promoted, np.sign(moved) * PIECE_CODES['queen'], moved)
+    batch[rows, from_squares] = 0
+    return batch
+
+
+class BatchEvaluator:
+    """
+    Scores (N, 64) int8 position batches from white's point of view.
+
+    square_values is ChessAI.square_values: material plus position per
+    (color, piece type, square), negative for black.
+    """
+
+    def __init__(self, square_values):
+        self.table = np.zeros((2 * EMPTY_ROW + 1, 64), dtype=np.int32)
+        for piece_type, code in PIECE_CODES.items():
+            self.table[EMPTY_ROW + code] = square_values['white'][piece_type]
+            self.table[EMPTY_ROW - code] = square_values['black'][piece_type]
+        self.squares = np.arange(64)
+
+    def evaluate(self, batch):
+        return self.table[batch + EMPTY_ROW, self.squares].sum(axis=1)
+
+
+def load_saved_position(file_name):
+    with open(file_name, 'rb') as file:
+        game_state = pickle.load(file)
+    board = Position(turn=game_state['current_turn'])
+    board.load_pieces(game_state['board'])
+    return board
+
+
+def evaluate_saved_games(evaluator, file_names):
+    # {file name: score} for games written by main3.save_game, scored in a single batch
+    batch = np.stack([encode_position(load_saved_position(file_name)) for file_name in file_names])
+    return dict(zip(file_names, evaluator.evaluate(batch).tolist()))
+
+
+if __name__ == "__main__":
+    from game_rules import GameRules
+    from chess_ai import ChessAI
+
+    if not HAS_NUMPY:
+        sys.exit("numpy is required for batched evaluation: pip install numpy")
+    board = Position()
+    ai = ChessAI(board, GameRules(board), tt_size_mb=1, incremental_eval=False)
+    scores = evaluate_saved_games(BatchEvaluator(ai.square_values), sys.argv[1:] or ["saved_game.pkl"])
+    for file_name, score in scores.items():
+        print(f"{file_name}: {score:+d}")
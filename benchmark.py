@@ -0,0 +1,278 @@
+"""
+Engine microbenchmarks. Run with: python benchmark.py
+"""
+import os
+import tempfile
+import timeit
+
+from position import Position, placements_from_rows
+from game_rules import GameRules
+from chess_ai import ChessAI
+from search_cache import SearchCache
+from batch_eval import HAS_NUMPY, encode_position, encode_children
+
+# Rows are listed from row 7 down to row 0, upper case is white, '.' is empty.
+POSITIONS = {
+    'start': [
+        'rnbqkbnr',
+        'pppppppp',
+        '........',
+        '........',
+        '........',
+        '........',
+        'PPPPPPPP',
+        'RNBQKBNR',
+    ],
+    'open middlegame': [
+        'r..q.rk.',
+        'pp..bppp',
+        '..n.pn..',
+        '...p....',
+        '..PP....',
+        '..N..N..',
+        'PP..BPPP',
+        'R..QKB.R',
+    ],
+    'closed middlegame': [
+        'r.bq.rk.',
+        '.p..bppp',
+        'p.npp...',
+        '....P...',
+        '..PP.n..',
+        '.PN..N..',
+        'P....PPP',
+        'R.BQ.RK.',
+    ],
+    'queens and rooks': [
+        '..r...k.',
+        'pp...ppp',
+        '..q.....',
+        '........',
+        '...Q....',
+        '....R...',
+        'PP...PPP',
+        '......K.',
+    ],
+}
+
+
+def make_board(rows=None):
+    board = Position()
+    if rows is not None:
+        board.load_pieces(placements_from_rows(rows))
+    return board
+
+
+# per-piece direction patterns of the original generator
+DIRECTIONS = {
+    'rook': [(-1, 0), (1, 0), (0, -1), (0, 1)],
+    'knight': [(-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)],
+    'bishop': [(-1, -1), (-1, 1), (1, -1), (1, 1)],
+    'queen': [(-1, -1), (-1, 1), (1, -1), (1, 1), (0, 1), (1, 0), (-1, 0), (0, -1)],
+    'king': [(-1, -1), (-1, 1), (1, -1), (1, 1), (0, 1), (1, 0), (-1, 0), (0, -1)],
+}
+
+
+def direction_moves(piece, board):
+    # the original per-piece generator, walking one square at a time, kept as the baseline
+    row, col = piece.position
+    moves = []
+    if piece.type == 'pawn':
+        direction = 1 if piece.color == 'white' else -1
+        new_row = row + direction
+        if 0 <= new_row < 8:
+            if not board.get_piece_at((new_row, col)):
+                moves.append((new_row, col))
+                if not piece.moved_once:
+                    second_row = row + 2 * direction
+                    if 0 <= second_row < 8 and not board.get_piece_at((second_row, col)):
+                        moves.append((second_row, col))
+            for capture_col in (col - 1, col + 1):
+                if 0 <= capture_col < 8:
+                    target = board.get_piece_at((new_row, capture_col))
+                    if target and target.color != piece.color:
+                        moves.append((new_row, capture_col))
+        return moves
+
+    sliding = piece.type in ('rook', 'bishop', 'queen')
+    for row_step, col_step in DIRECTIONS[piece.type]:
+        new_row, new_col = row + row_step, col + col_step
+        while 0 <= new_row < 8 and 0 <= new_col < 8:
+            if board.is_empty_square(new_row, new_col):
+                moves.append((new_row, new_col))
+            elif board.is_opponent_piece(new_row, new_col, piece.color):
+                moves.append((new_row, new_col))
+                break
+            else:
+                break
+            if not sliding:
+                break
+            new_row += row_step
+            new_col += col_step
+    return moves
+
+
+def bench_move_generation(number=2000):
+    print("Move generation, all pieces of both colors (ms per position)")
+    print(f"{'position':<20}{'original':>10}{'tables':>10}{'speed-up':>10}")
+    for name, rows in POSITIONS.items():
+        board = make_board(rows)
+        pieces = board.pieces
+        for piece in pieces:
+            assert sorted(piece.get_possible_moves(board)) == sorted(direction_moves(piece, board))
+
+        original_time = timeit.timeit(lambda: [direction_moves(p, board) for p in pieces], number=number)
+        table_time = timeit.timeit(lambda: [p.get_possible_moves(board) for p in pieces], number=number)
+        print(f"{name:<20}{original_time * 1000 / number:>10.4f}{table_time * 1000 / number:>10.4f}"
+              f"{original_time / table_time:>9.2f}x")
+
+
+def run_search(board, depth, **options):
+    ai = ChessAI(board, GameRules(board), depth=depth, **options)
+    ai.get_best_move(board.turn)
+    return ai
+
+
+def bench_move_ordering(depth=4):
+    print(f"Fixed depth {depth} search, unordered vs ordered moves")
+    print(f"{'position':<20}{'ordering':>10}{'nodes':>10}{'1st cut':>10}{'time':>10}")
+    for name, rows in POSITIONS.items():
+        for move_ordering in (False, True):
+            ai = run_search(make_board(rows), depth, move_ordering=move_ordering)
+            stats = ai.search_stats
+            print(f"{name:<20}{'on' if move_ordering else 'off':>10}{stats['nodes']:>10}"
+                  f"{ai.first_move_cutoff_rate():>10.0%}{stats['time']:>9.2f}s")
+
+
+def bench_pruning(depth=5):
+    print(f"Fixed depth {depth} search, null-move pruning and late move reductions")
+    print(f"{'position':<20}{'null move':>10}{'lmr':>10}{'nodes':>10}{'time':>10}{'best move':>16}")
+    for name, rows in POSITIONS.items():
+        for null_move_pruning, late_move_reductions in ((False, False), (True, False), (False, True), (True, True)):
+            board = make_board(rows)
+            ai = ChessAI(board, GameRules(board), depth=depth, null_move_pruning=null_move_pruning,
+                         late_move_reductions=late_move_reductions)
+            piece, destination = ai.get_best_move(board.turn)
+            stats = ai.search_stats
+            print(f"{name:<20}{'on' if null_move_pruning else 'off':>10}{'on' if late_move_reductions else 'off':>10}"
+                  f"{stats['nodes']:>10}{stats['time']:>9.2f}s{str(piece.position) + str(destination):>16}")
+
+
+def bench_horizon_pruning(depth=5):
+    print(f"Fixed depth {depth} search, futility pruning and razoring")
+    print(f"{'position':<20}{'pruning':>10}{'nodes':>10}{'futile':>10}{'ext fut':>10}{'razor':>10}{'time':>10}")
+    for name, rows in POSITIONS.items():
+        for enabled in (False, True):
+            ai = run_search(make_board(rows), depth, futility_pruning=enabled, razoring=enabled)
+            stats = ai.search_stats
+            print(f"{name:<20}{'on' if enabled else 'off':>10}{stats['nodes']:>10}{stats['futility_prunes']:>10}"
+                  f"{stats['extended_futility_prunes']:>10}{stats['razor_cutoffs']:>10}{stats['time']:>9.2f}s")
+
+
+def bench_incremental_eval(depth=5):
+    print(f"Fixed depth {depth} search, per-piece vs incremental evaluation")
+    print(f"{'position':<20}{'per-piece':>10}{'running':>10}{'speed-up':>10}")
+    for name, rows in POSITIONS.items():
+        full = run_search(make_board(rows), depth, incremental_eval=False)
+        incremental = run_search(make_board(rows), depth, incremental_eval=True)
+        assert full.search_stats['nodes'] == incremental.search_stats['nodes']
+        full_time, incremental_time = full.search_stats['time'], incremental.search_stats['time']
+        print(f"{name:<20}{full_time:>9.2f}s{incremental_time:>9.2f}s{full_time / incremental_time:>9.2f}x")
+
+
+def bench_eval_caches(depth=5):
+    print(f"Fixed depth {depth} search, evaluation and pawn structure cache hit rates")
+    print(f"{'position':<20}{'nodes':>10}{'eval hit':>10}{'pawn hit':>10}{'time':>10}")
+    for name, rows in POSITIONS.items():
+        ai = run_search(make_board(rows), depth)
+        stats = ai.search_stats
+        print(f"{name:<20}{stats['nodes']:>10}{stats['eval_cache_hit_rate']:>10.0%}"
+              f"{stats['pawn_cache_hit_rate']:>10.0%}{stats['time']:>9.2f}s")
+
+
+def bench_batch_eval(number=200):
+    if not HAS_NUMPY:
+        print("Batched evaluation skipped, numpy is not installed")
+        return
+    print("Scoring every child of a position, per-piece loop vs one NumPy batch (ms per position)")
+    print(f"{'position':<20}{'children':>10}{'per-piece':>10}{'batched':>10}{'speed-up':>10}")
+    for name, rows in POSITIONS.items():
+        board = make_board(rows)
+        ai = ChessAI(board, GameRules(board), tt_size_mb=1, incremental_eval=False, batch_eval=True)
+        moves = ai.get_legal_moves(board.turn)
+
+        def per_piece():
+            scores = []
+            for move in moves:
+                board.make_move(move)
+                scores.append(ai.compute_evaluation())
+                board.unmake_move()
+            return scores
+
+        def batched():
+            return ai.batch_evaluator.evaluate(encode_children(encode_position(board), moves)).tolist()
+
+        assert per_piece() == batched()
+        loop_time = timeit.timeit(per_piece, number=number)
+        batch_time = timeit.timeit(batched, number=number)
+        print(f"{name:<20}{len(moves):>10}{loop_time * 1000 / number:>10.3f}{batch_time * 1000 / number:>10.3f}"
+              f"{loop_time / batch_time:>9.2f}x")
+
+
+def bench_parallel(depth=5, workers=None):
+    workers = workers or min(os.cpu_count() or 1, 8)
+    print(f"Fixed depth {depth} search, single process vs root-parallel over {workers} workers, "
+          f"with private and shared tables")
+    print(f"{'position':<20}{'single':>10}{'private':>10}{'speed-up':>10}{'shared':>10}{'speed-up':>10}"
+          f"{'same move':>10}")
+    for name, rows in POSITIONS.items():
+        moves, times = [], []
+        for worker_count, shared_tt in ((1, False), (workers, False), (workers, True)):
+            board = make_board(rows)
+            ai = ChessAI(board, GameRules(board), depth=depth, workers=worker_count, shared_tt=shared_tt)
+            piece, destination = ai.get_best_move(board.turn)
+            ai.close()
+            moves.append((piece.position, destination))
+            times.append(ai.search_stats['time'])
+        single_time, private_time, shared_time = times
+        print(f"{name:<20}{single_time:>9.2f}s{private_time:>9.2f}s{single_time / private_time:>9.2f}x"
+              f"{shared_time:>9.2f}s{single_time / shared_time:>9.2f}x"
+              f"{'yes' if len(set(moves)) == 1 else 'no':>10}")
+
+
+def bench_search_cache(depth=5):
+    print(f"Depth {depth} first move of each position, cold vs warm persistent search cache")
+    print(f"{'position':<20}{'cold':>10}{'warm':>10}{'cached':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "search_cache.bin")
+        for name, rows in POSITIONS.items():
+            times = []
+            for _ in range(2):
+                # a fresh engine and cache each time, as after a restart
+                board = make_board(rows)
+                search_cache = SearchCache(cache_path)
+                ai = ChessAI(board, GameRules(board), depth=depth, search_cache=search_cache)
+                ai.get_best_move(board.turn)
+                search_cache.close()
+                times.append(ai.search_stats['time'])
+            print(f"{name:<20}{times[0]:>9.3f}s{times[1]:>9.3f}s{'yes' if ai.search_stats['nodes'] == 0 else 'no':>10}")
+
+
+if __name__ == "__main__":
+    bench_move_generation()
+    print()
+    bench_move_ordering()
+    print()
+    bench_pruning()
+    print()
+    bench_horizon_pruning()
+    print()
+    bench_incremental_eval()
+    print()
+    bench_eval_caches()
+    print()
+    bench_batch_eval()
+    print()
+    bench_parallel()
+    print()
+    bench_search_cache()
@@ -0,0 +1,152 @@
+# Bitboard helpers. Square index is row * 8 + col, bit n of a board is square n.
+# Row 0 is white's back rank, so "north" (row + 1) is a left shift by 8.
+
+FULL = (1 << 64) - 1
+
+FILE_A = 0x0101010101010101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+
+NOT_FILE_A = FULL ^ FILE_A
+NOT_FILE_H = FULL ^ FILE_H
+NOT_FILE_AB = FULL ^ (FILE_A | FILE_B)
+NOT_FILE_GH = FULL ^ (FILE_G | FILE_H)
+
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+COLORS = ('white', 'black')
+
+
+def iter_squares(bb):
+    while bb:
+        low_bit = bb & -bb
+        yield low_bit.bit_length() - 1
+        bb ^= low_bit
+
+
+def to_positions(bb):
+    positions = []
+    while bb:
+        low_bit = bb & -bb
+        positions.append(SQUARE_POSITIONS[low_bit.bit_length() - 1])
+        bb ^= low_bit
+    return positions
+
+
+def north(bb):
+    return (bb << 8) & FULL
+
+
+def south(bb):
+    return bb >> 8
+
+
+def east(bb):
+    return (bb << 1) & NOT_FILE_A & FULL
+
+
+def west(bb):
+    return (bb >> 1) & NOT_FILE_H
+
+
+def north_east(bb):
+    return (bb << 9) & NOT_FILE_A & FULL
+
+
+def north_west(bb):
+    return (bb << 7) & NOT_FILE_H & FULL
+
+
+def south_east(bb):
+    return (bb >> 7) & NOT_FILE_A
+
+
+def south_west(bb):
+    return (bb >> 9) & NOT_FILE_H
+
+
+def knight_attacks(bb):
+    return (((bb << 17) & NOT_FILE_A) | ((bb << 15) & NOT_FILE_H) |
+            ((bb << 10) & NOT_FILE_AB) | ((bb << 6) & NOT_FILE_GH) |
+            ((bb >> 17) & NOT_FILE_H) | ((bb >> 15) & NOT_FILE_A) |
+            ((bb >> 10) & NOT_FILE_GH) | ((bb >> 6) & NOT_FILE_AB)) & FULL
+
+
+def king_attacks(bb):
+    sideways = east(bb) | west(bb)
+    row = bb | sideways
+    return sideways | north(row) | south(row)
+
+
+def pawn_attacks(bb, color):
+    if color == 'white':
+        return north_east(bb) | north_west(bb)
+    return south_east(bb) | south_west(bb)
+
+
+# Per-square lookup tables, built once at import time.
+
+SQUARE_POSITIONS = [(square >> 3, square & 7) for square in range(64)]
+
+KNIGHT_ATTACKS = [knight_attacks(1 << square) for square in range(64)]
+KING_ATTACKS = [king_attacks(1 << square) for square in range(64)]
+PAWN_ATTACKS = {color: [pawn_attacks(1 << square, color) for square in range(64)] for color in COLORS}
+
+
+def _pushes(square, color):
+    # single push first, then the double step target
+    step = 8 if color == 'white' else -8
+    pushes = []
+    for target in (square + step, square + 2 * step):
+        if 0 <= target < 64:
+            pushes.append(target)
+    return pushes
+
+
+PAWN_PUSHES = {color: [_pushes(square, color) for square in range(64)] for color in COLORS}
+
+
+def _ray(square, shift):
+    # squares reached from square along shift, nearest first
+    ray = []
+    bb = shift(1 << square)
+    while bb:
+        ray.append(bb.bit_length() - 1)
+        bb = shift(bb)
+    return ray
+
+
+DIRECTIONS = {
+    'north': north, 'south': south, 'east': east, 'west': west,
+    'north_east': north_east, 'north_west': north_west,
+    'south_east': south_east, 'south_west': south_west
+}
+ORTHOGONAL_DIRECTIONS = ('north', 'south', 'east', 'west')
+DIAGONAL_DIRECTIONS = ('north_east', 'north_west', 'south_east', 'south_west')
+
+RAYS = {name: [_ray(square, shift) for square in range(64)] for name, shift in DIRECTIONS.items()}
+
+# rays grouped per square for each slider, empty rays dropped
+ROOK_RAYS = [[RAYS[name][square] for name in ORTHOGONAL_DIRECTIONS if RAYS[name][square]]
+             for square in range(64)]
+BISHOP_RAYS = [[RAYS[name][square] for name in DIAGONAL_DIRECTIONS if RAYS[name][square]]
+               for square in range(64)]
+QUEEN_RAYS = [ROOK_RAYS[square] + BISHOP_RAYS[square] for square in range(64)]
+
+# pawn structure masks
+FILES = [FILE_A << col for col in range(8)]
+ADJACENT_FILES = [(FILES[col - 1] if col > 0 else 0) | (FILES[col + 1] if col < 7 else 0) for col in range(8)]
+
+
+def _passed_pawn_mask(square, color):
+    # squares ahead of a pawn on its own and the adjacent files, where an enemy pawn stops it being passed
+    files = FILES[square & 7] | ADJACENT_FILES[square & 7]
+    row = square >> 3
+    if color == 'white':
+        ahead = FULL ^ ((1 << (row + 1) * 8) - 1)
+    else:
+        ahead = (1 << row * 8) - 1
+    return files & ahead
+
+
+PASSED_PAWN_MASKS = {color: [_passed_pawn_mask(square, color) for square in range(64)] for color in COLORS}
@@ -1,11 +1,128 @@
 from piece2 import King, Queen, Rook, Bishop, Knight, Pawn
+from position import Position, FIFTY_MOVE_PLIES
+from game_rules import GameRules
+from batch_eval import HAS_NUMPY, BatchEvaluator, encode_position, encode_children
+from bitboard import FILES, ADJACENT_FILES, PASSED_PAWN_MASKS, iter_squares
+from transposition import (TranspositionTable, SharedTranspositionTable, ScoreCache, EXACT, LOWER_BOUND, UPPER_BOUND, NO_MOVE, encode_move,
+                           decode_move)
+from operator import itemgetter
+import multiprocessing
 import time
 
+# nodes searched between two checks of the time and node budget
+BUDGET_CHECK_INTERVAL = 1024
+MAX_PLY = 64
+# score of being checkmated at the root; a mate found at ply n scores MATE_SCORE - n
+MATE_SCORE = 1000000
+MATE_BOUND = MATE_SCORE - MAX_PLY
+# shallower results are not worth a slot in the persistent search cache
+SEARCH_CACHE_MIN_DEPTH = 3
+
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# quiet moves from this index on, at this depth or more, are searched one ply shallower first
+LATE_MOVE_INDEX = 3
+LATE_MOVE_MIN_DEPTH = 3
+
+# move ordering bands: hash move, then captures (MVV-LVA), then killers, then quiet moves by history
+HASH_MOVE_SCORE = 1 << 40
+CAPTURE_SCORE = 1 << 30
+KILLER_SCORE = 1 << 29
+
+# pawn structure terms
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 12
+# by rows advanced from the pawn's own back rank
+PASSED_PAWN_BONUS = (0, 5, 10, 20, 35, 60, 100, 0)
+
+# half width of the root window around the previous iteration's score
+ASPIRATION_WINDOW = 50
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def score_to_table(score, ply):
+    # mate scores are stored as distance from the node rather than from the root
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+# root-parallel search: each pool process holds one engine, built by the initializer
+_worker_ai = None
+
+
+def _init_worker(options):
+    global _worker_ai
+    board = Position()
+    _worker_ai = ChessAI(board, GameRules(board), **options)
+
+
+def _search_root_moves(task):
+    return _worker_ai.search_root_moves(*task)
+
+
 class ChessAI:
-    def __init__(self, board, game_rules, depth=3):
+    def __init__(self, board, game_rules, depth=3, tt_size_mb=16, time_limit=None, node_limit=None,
+                 move_ordering=True, quiescence=True, null_move_pruning=True, late_move_reductions=True,
+                 futility_pruning=True, razoring=True, incremental_eval=True,
+                 batch_eval=False, workers=1, shared_tt=False, tt_name=None, search_cache=None,
+                 pawn_cache_size=1 << 14, eval_cache_size=1 << 16):
         self.board = board
         self.game_rules = game_rules
+        # maximum depth; with a time or node limit the search deepens until the budget runs out
         self.depth = depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt_size_mb = tt_size_mb
+        # with shared_tt the root-parallel workers all use one table in shared memory, attached by tt_name
+        self.tt_name = tt_name
+        if tt_name is not None:
+            self.transposition_table = SharedTranspositionTable(name=tt_name)
+        elif shared_tt and workers > 1:
+            self.transposition_table = SharedTranspositionTable(tt_size_mb)
+        else:
+            self.transposition_table = TranspositionTable(tt_size_mb)
+        # position hash -> encoded move along the last completed iteration's best line
+        self.principal_variation = {}
+        self.nodes = 0
+        # node count at which the budget is next checked
+        self.next_budget_check = BUDGET_CHECK_INTERVAL
+        self.deadline = None
+        self.budget_enforced = False
+        # processes splitting the root moves from depth 2 on; the pool is started at the end of __init__
+        self.workers = workers
+        self.pool = None
+        # pawn structure scores by pawn hash, and whole evaluations by position hash
+        self.pawn_cache = ScoreCache(pawn_cache_size)
+        self.eval_cache = ScoreCache(eval_cache_size)
+        # optional on-disk SearchCache of root results, shared by games and restarts; engines playing in the
+        # same process share one instance, since each would otherwise write the file header on its own
+        self.search_cache = search_cache
+
+        self.move_ordering = move_ordering
+        self.quiescence = quiescence
+        self.null_move_pruning = null_move_pruning
+        self.late_move_reductions = late_move_reductions
+        self.futility_pruning = futility_pruning
+        self.razoring = razoring
+        # two quiet moves per ply that caused a beta cutoff
+        self.killer_moves = [[NO_MOVE, NO_MOVE] for _ in range(MAX_PLY)]
+        # cutoff credit per (from square, to square) of quiet moves, per color
+        self.history = {'white': [0] * 4096, 'black': [0] * 4096}
+        self.search_stats = {}
         
         self.piece_values = {
             'pawn': 100,
@@ -15,6 +132,9 @@ class ChessAI:
             'queen': 900,
             'king': 20000
         }
+        # indexed by remaining depth: frontier nodes, then extended futility and razoring one ply above
+        self.futility_margins = [0, self.piece_values['bishop'], self.piece_values['rook']]
+        self.razor_margins = [0, self.piece_values['rook'], self.piece_values['queen']]
         
         self.pawn_table = [
             [0,  0,  0,  0,  0,  0,  0,  0],
@@ -82,119 +202,615 @@ class ChessAI:
             [20, 30, 10,  0,  0, 10, 30, 20]
         ]
 
+        tables = {
+            'pawn': self.pawn_table,
+            'knight': self.knight_table,
+            'bishop': self.bishop_table,
+            'rook': self.rook_table,
+            'queen': self.queen_table,
+            'king': self.king_table
+        }
+        # flat 64-entry tables indexed by row * 8 + col, black reads its table upside down
+        self.position_tables = {
+            'white': {piece_type: [value for row in table for value in row] for piece_type, table in tables.items()},
+            'black': {piece_type: [value for row in table[::-1] for value in row] for piece_type, table in tables.items()}
+        }
+        # material plus position of each piece on each square, negative for black, so a position scores as a plain sum
+        self.square_values = {
+            color: {piece_type: [sign * (self.piece_values[piece_type] + value) for value in table]
+                    for piece_type, table in self.position_tables[color].items()}
+            for color, sign in (('white', 1), ('black', -1))
+        }
+        # the board keeps a running sum of square_values, so a leaf costs one lookup
+        self.incremental_eval = incremental_eval
+        if incremental_eval:
+            board.set_square_values(self.square_values)
+        # opt-in: without the running score and quiescence, frontier children are scored together in one NumPy batch
+        self.batch_evaluator = None
+        if batch_eval and not incremental_eval and HAS_NUMPY:
+            self.batch_evaluator = BatchEvaluator(self.square_values)
+        # fork the workers now, on the constructing thread, rather than from a search thread later
+        if self.workers > 1:
+            self.get_pool()
+
+    def get_legal_moves(self, color):
+        return self.game_rules.legal_moves(color)
+
+    def get_legal_captures(self, color):
+        return self.game_rules.legal_moves(color, captures_only=True)
+
     def get_best_move(self, color):
-        """Returns the best move for the given color using minimax with alpha-beta pruning."""
-        self.positions_evaluated = 0  # Reset counter
+        """Returns the best move for the given color using iterative deepening negamax with principal variation search."""
         start_time = time.time()  # Start timing
-        
-        best_value = float('-inf') if color == 'white' else float('inf')
+        self.deadline = start_time + self.time_limit if self.time_limit else None
+        self.reset_search_state()
+        for table in self.history.values():
+            for index, value in enumerate(table):
+                if value:
+                    table[index] = value >> 1
+
         best_move = None
-        alpha = float('-inf')
-        beta = float('inf')
-        
-        pieces = [p for p in self.board.pieces if p.color == color]
-        
-        for piece in pieces:
-            possible_moves = piece.get_possible_moves(self.board)
-            for move in possible_moves:
-                if self.game_rules.is_move_legal(piece, move):
-                    self.positions_evaluated += 1  # Increment counter
-                    old_pos = piece.position
-                    captured_piece = self.board.get_piece_at(move)
-                    if captured_piece:
-                        self.board.pieces.remove(captured_piece)
-                    piece.position = move
-                    
-                    if color == 'white':
-                        value = self.minimax(self.depth - 1, alpha, beta, False)
-                        if value > best_value:
-                            best_value = value
-                            best_move = (piece, move)
-                        alpha = max(alpha, value)
-                    else:
-                        value = self.minimax(self.depth - 1, alpha, beta, True)
-                        if value < best_value:
-                            best_value = value
-                            best_move = (piece, move)
-                        beta = min(beta, value)
-                    
-                    piece.position = old_pos
-                    if captured_piece:
-                        self.board.pieces.append(captured_piece)
-                    
-                    if alpha >= beta:
-                        break
-        
+        best_value = None
+        completed_depth = 0
+        root_moves = self.get_legal_moves(color)
+        stack_size = len(self.board.move_stack)
+
+        # the cache keeps no game history, so once a repetition or the 50-move rule could come into play its
+        # results are neither trusted as the answer nor stored, only its move is tried first
+        history_free = self.board.halfmove_clock < 3
+        cached = self.probe_search_cache(root_moves)
+        if cached is not None:
+            cached_depth, cached_value, cached_move = cached
+            if cached_depth >= self.depth and history_free:
+                # deep enough to answer without searching
+                best_move, best_value, completed_depth = cached_move, cached_value, cached_depth
+            root_moves.remove(cached_move)
+            root_moves.insert(0, cached_move)
+
+        for depth in range(completed_depth + 1, self.depth + 1):
+            # the first iteration always completes so there is a move to return
+            self.budget_enforced = depth > 1
+            try:
+                if self.workers > 1 and depth > 1 and len(root_moves) > 1:
+                    move, value = self.search_root_parallel(color, depth, root_moves)
+                else:
+                    move, value = self.aspiration_search(color, depth, root_moves, best_value)
+            except SearchTimeout:
+                while len(self.board.move_stack) > stack_size:
+                    self.board.unmake_move()
+                break
+
+            if move is None:
+                break
+            best_move = move
+            best_value = value
+            completed_depth = depth
+            self.transposition_table.store(self.board.hash, depth, value, EXACT, encode_move(move))
+            # search the best line of this iteration first in the next one
+            self.principal_variation = self.get_principal_variation(depth)
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if self.budget_exhausted():
+                break
+
+        if (self.search_cache is not None and best_move is not None and history_free and
+                completed_depth >= SEARCH_CACHE_MIN_DEPTH and (cached is None or completed_depth > cached[0])):
+            self.search_cache.store(self.board.hash, completed_depth, best_value, encode_move(best_move))
+
+        self.positions_evaluated = self.nodes
         evaluation_time = time.time() - start_time  # Calculate time taken
+        self.search_stats['nodes'] = self.nodes
+        self.search_stats['pawn_cache_hit_rate'] = self.pawn_cache.hit_rate()
+        self.search_stats['eval_cache_hit_rate'] = self.eval_cache.hit_rate()
+        self.search_stats['depth'] = completed_depth
+        self.search_stats['time'] = evaluation_time
     
         # Update status display with AI statistics
         if hasattr(self, 'status_display'):
             self.status_display.update_ai_stats(
-                self.depth,
+                completed_depth,
                 self.positions_evaluated,
-                evaluation_time
+                evaluation_time,
+                self.transposition_table.hit_rate(),
+                self.transposition_table.fill(),
+                self.first_move_cutoff_rate()
             )
         
         return best_move
 
-    def minimax(self, depth, alpha, beta, maximizing_player):
-        if depth == 0 or self.game_rules.is_game_over():
-            return self.evaluate_position()
-        
-        if maximizing_player:
-            max_eval = float('-inf')
-            pieces = [p for p in self.board.pieces if p.color == 'white']
-            
-            for piece in pieces:
-                possible_moves = piece.get_possible_moves(self.board)
-                for move in possible_moves:
-                    if self.game_rules.is_move_legal(piece, move):
-                        old_pos = piece.position
-                        captured_piece = self.board.get_piece_at(move)
-                        if captured_piece:
-                            self.board.pieces.remove(captured_piece)
-                        piece.position = move
-                        
-                        eval = self.minimax(depth - 1, alpha, beta, False)
-                        max_eval = max(max_eval, eval)
-                        alpha = max(alpha, eval)
-                        
-                        piece.position = old_pos
-                        if captured_piece:
-                            self.board.pieces.append(captured_piece)
-                        
-                        if beta <= alpha:
-                            break
-                            
-            return max_eval
+    def probe_search_cache(self, root_moves):
+        # (depth, score, move) stored for this position, if its move is still a legal root move
+        if self.search_cache is None:
+            return None
+        entry = self.search_cache.probe(self.board.hash)
+        if entry is None:
+            return None
+        depth, value, encoded = entry
+        move = decode_move(self.board, encoded)
+        if move not in root_moves:
+            return None
+        return depth, value, move
+
+    def reset_search_state(self):
+        self.nodes = 0
+        self.schedule_budget_check()
+        self.transposition_table.new_search()
+        self.pawn_cache.new_search()
+        self.eval_cache.new_search()
+        self.principal_variation = {}
+        self.killer_moves = [[NO_MOVE, NO_MOVE] for _ in range(MAX_PLY)]
+        self.search_stats = {'cutoffs': 0, 'first_move_cutoffs': 0, 'null_moves': 0, 'null_move_cutoffs': 0,
+                             'reductions': 0, 're_searches': 0, 'futility_prunes': 0,
+                             'extended_futility_prunes': 0, 'razor_cutoffs': 0, 'aspiration_researches': 0,
+                             'repetition_draws': 0}
+
+    def engine_options(self):
+        # settings a worker engine needs to search exactly like this one
+        return {
+            'tt_size_mb': self.tt_size_mb,
+            'node_limit': self.node_limit,
+            'move_ordering': self.move_ordering,
+            'quiescence': self.quiescence,
+            'null_move_pruning': self.null_move_pruning,
+            'late_move_reductions': self.late_move_reductions,
+            'futility_pruning': self.futility_pruning,
+            'razoring': self.razoring,
+            'incremental_eval': self.incremental_eval,
+            'batch_eval': self.batch_evaluator is not None,
+            'tt_name': getattr(self.transposition_table, 'name', None),
+            'pawn_cache_size': self.pawn_cache.size,
+            'eval_cache_size': self.eval_cache.size
+        }
+
+    def get_pool(self):
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers, _init_worker, (self.engine_options(),))
+        return self.pool
+
+    def close(self):
+        # stops the worker pool and releases a shared table; call once the game ends. A search cache is
+        # closed by whoever created it, as it may be shared with other engines
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        if isinstance(self.transposition_table, SharedTranspositionTable):
+            self.transposition_table.close()
+
+    def search_root_parallel(self, color, depth, root_moves):
+        # The first (best so far) move is searched here and its score becomes the shared alpha, re-synced
+        # every iteration. The remaining moves are dealt round-robin to the workers, and the results are
+        # combined by score with ties going to the earlier root move, so arrival order never matters.
+        first_move, alpha = self.search_root(color, depth, root_moves[:1], float('-inf'), float('inf'))
+        position = self.board.copy()
+        tasks = []
+        for worker in range(self.workers):
+            moves = root_moves[1 + worker::self.workers]
+            if moves:
+                tasks.append((position, depth, [encode_move(move) for move in moves], alpha, float('inf'),
+                              self.deadline))
+
+        best_move, best_value = first_move, alpha
+        best_index = 0
+        root_index = {encode_move(move): index for index, move in enumerate(root_moves)}
+        timed_out = False
+        for encoded, value, nodes in self.get_pool().map(_search_root_moves, tasks):
+            self.nodes += nodes
+            if encoded is None:
+                timed_out = True
+                continue
+            index = root_index[encoded]
+            if value > best_value or (value == best_value and index < best_index):
+                best_move, best_value, best_index = root_moves[index], value, index
+        if timed_out:
+            raise SearchTimeout()
+        return best_move, best_value
+
+    def search_root_moves(self, position, depth, encoded_moves, alpha, beta, deadline):
+        # worker side of search_root_parallel; engine state starts empty for every task, so the result
+        # depends on the task alone, unless the table is shared and other processes fill it meanwhile
+        self.board.pieces = position.pieces
+        self.board.set_turn(position.turn)
+        self.board.history = position.history
+        self.board.halfmove_clock = position.halfmove_clock
+        if self.tt_name is None:
+            self.transposition_table.clear()
+        self.reset_search_state()
+        self.history = {'white': [0] * 4096, 'black': [0] * 4096}
+        self.deadline = deadline
+        self.budget_enforced = True
+        moves = [decode_move(self.board, encoded) for encoded in encoded_moves]
+        try:
+            move, value = self.search_root(position.turn, depth, moves, alpha, beta)
+        except SearchTimeout:
+            return None, None, self.nodes
+        return encode_move(move), value, self.nodes
+
+    def aspiration_search(self, color, depth, root_moves, previous_value):
+        # a narrow window around the last score, widened to the failing side when the score falls outside it
+        if previous_value is None:
+            return self.search_root(color, depth, root_moves, float('-inf'), float('inf'))
+
+        alpha = previous_value - ASPIRATION_WINDOW
+        beta = previous_value + ASPIRATION_WINDOW
+        while True:
+            move, value = self.search_root(color, depth, root_moves, alpha, beta)
+            if value <= alpha:
+                alpha = float('-inf')
+            elif value >= beta:
+                beta = float('inf')
+            else:
+                return move, value
+            self.search_stats['aspiration_researches'] += 1
+
+    def search_root(self, color, depth, root_moves, alpha, beta):
+        # scores are from the point of view of color, which must be the side to move
+        best_value = float('-inf')
+        best_move = None
+
+        for index, move in enumerate(root_moves):
+            self.board.make_move(move)
+            if index == 0:
+                value = -self.negamax(depth - 1, -beta, -alpha, 1)
+            else:
+                value = -self.negamax(depth - 1, -alpha - 1, -alpha, 1)
+                if alpha < value < beta:
+                    value = -self.negamax(depth - 1, -beta, -alpha, 1)
+            self.board.unmake_move()
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        return best_move, best_value
+
+    def budget_exhausted(self):
+        if self.node_limit and self.nodes >= self.node_limit:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def schedule_budget_check(self):
+        self.next_budget_check = self.nodes + BUDGET_CHECK_INTERVAL
+        if self.node_limit:
+            self.next_budget_check = min(self.next_budget_check, max(self.node_limit, self.nodes + 1))
+
+    def check_budget(self):
+        # the node count can jump by more than one, so it is compared against a threshold, not a multiple
+        if self.budget_enforced and self.nodes >= self.next_budget_check:
+            self.schedule_budget_check()
+            if self.budget_exhausted():
+                raise SearchTimeout()
+
+    def get_principal_variation(self, length):
+        # follows the stored best moves from the root, returns {position hash: encoded move}
+        variation = {}
+        played = 0
+        for _ in range(length):
+            entry = self.transposition_table.probe(self.board.hash)
+            move = decode_move(self.board, entry[3]) if entry else None
+            if (move is None or move[0].color != self.board.turn or self.board.hash in variation or
+                    move not in self.game_rules.legal_moves(self.board.turn)):
+                break
+            variation[self.board.hash] = entry[3]
+            self.board.make_move(move)
+            played += 1
+        for _ in range(played):
+            self.board.unmake_move()
+        return variation
+
+    def order_moves(self, moves, ply, hash_move):
+        if not self.move_ordering:
+            return moves
+
+        killers = self.killer_moves[ply] if ply < MAX_PLY else ()
+        history = self.history[self.board.turn]
+        squares = self.board.squares
+        scored_moves = []
+        for move in moves:
+            encoded = encode_move(move)
+            row, col = move[1]
+            target = squares[row * 8 + col]
+            if encoded == hash_move:
+                score = HASH_MOVE_SCORE
+            elif target is not None:
+                # most valuable victim first, least valuable attacker breaks ties
+                score = CAPTURE_SCORE + self.piece_values[target.type] * 64 - self.piece_values[move[0].type] // 100
+            elif encoded in killers:
+                score = KILLER_SCORE - killers.index(encoded)
+            else:
+                score = history[encoded]
+            scored_moves.append((score, move))
+        scored_moves.sort(key=itemgetter(0), reverse=True)
+        return [move for _, move in scored_moves]
+
+    def record_cutoff(self, move, move_index, depth, ply):
+        self.search_stats['cutoffs'] += 1
+        if move_index == 0:
+            self.search_stats['first_move_cutoffs'] += 1
+
+        if self.board.get_piece_at(move[1]) is None and ply < MAX_PLY:
+            encoded = encode_move(move)
+            killers = self.killer_moves[ply]
+            if killers[0] != encoded:
+                killers[1] = killers[0]
+                killers[0] = encoded
+            self.history[move[0].color][encoded] += depth * depth
+
+    def first_move_cutoff_rate(self):
+        cutoffs = self.search_stats.get('cutoffs', 0)
+        return self.search_stats['first_move_cutoffs'] / cutoffs if cutoffs else 0.0
+
+    def has_non_pawn_material(self, color):
+        pieces = self.board.bitboards[color]
+        return bool(pieces['knight'] | pieces['bishop'] | pieces['rook'] | pieces['queen'])
+
+    def is_quiet(self, move):
+        piece, (row, col) = move
+        if self.board.squares[row * 8 + col] is not None:
+            return False
+        return not (piece.type == 'pawn' and row == (7 if piece.color == 'white' else 0))
+
+    def null_move_search(self, depth, beta, ply):
+        # returns a cutoff score if passing the move still fails high, else None
+        self.search_stats['null_moves'] += 1
+        self.board.make_null_move()
+        value = -self.negamax(depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, False)
+        self.board.unmake_move()
+        if value < beta:
+            return None
+
+        # verification: a reduced search of this node without null moves, so zugzwang cannot fake a cutoff
+        value = self.negamax(depth - NULL_MOVE_REDUCTION, beta - 1, beta, ply, False)
+        if value < beta:
+            return None
+        self.search_stats['null_move_cutoffs'] += 1
+        return value
+
+    def razor(self, static_eval, depth, alpha, ply):
+        # returns the quiescence score if even a capture sequence cannot reach alpha, else None
+        if static_eval + self.razor_margins[depth] > alpha:
+            return None
+        value = self.quiescence_search(alpha, alpha + 1, ply)
+        if value > alpha:
+            return None
+        self.search_stats['razor_cutoffs'] += 1
+        return value
+
+    def negamax(self, depth, alpha, beta, ply=0, allow_null=True):
+        # fail-soft, scores are from the point of view of the side to move
+        self.nodes += 1
+        self.check_budget()
+
+        if ply > 0 and self.is_draw_by_rule():
+            self.search_stats['repetition_draws'] += 1
+            return 0
+
+        if depth == 0:
+            if self.quiescence:
+                return self.quiescence_search(alpha, beta, ply)
+            return self.evaluate_side_to_move()
+
+        key = self.board.hash
+        entry = self.transposition_table.probe(key)
+        hash_move = self.principal_variation.get(key, NO_MOVE)
+        if entry:
+            entry_depth, score, bound, stored_move = entry
+            score = score_from_table(score, ply)
+            if stored_move != NO_MOVE:
+                hash_move = stored_move
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score
+                if bound == LOWER_BOUND and score >= beta:
+                    return score
+                if bound == UPPER_BOUND and score <= alpha:
+                    return score
+
+        color = self.board.turn
+        opponent = 'black' if color == 'white' else 'white'
+        in_check = ((self.null_move_pruning or self.late_move_reductions or self.futility_pruning or self.razoring)
+                    and self.game_rules.is_in_check(color))
+
+        # the null window needs a finite beta, and king and pawn endings are left alone (zugzwang)
+        if (self.null_move_pruning and allow_null and ply > 0 and depth >= NULL_MOVE_MIN_DEPTH and not in_check
+                and beta != float('inf') and self.has_non_pawn_material(color)):
+            value = self.null_move_search(depth, beta, ply)
+            if value is not None:
+                return value
+
+        # near the horizon a static eval far below alpha lets quiet moves be skipped
+        futile = False
+        if depth <= 2 and ply > 0 and not in_check and (self.futility_pruning or self.razoring):
+            static_eval = self.evaluate_side_to_move()
+            if self.razoring and self.quiescence:
+                value = self.razor(static_eval, depth, alpha, ply)
+                if value is not None:
+                    return value
+            if self.futility_pruning:
+                futility_value = static_eval + self.futility_margins[depth]
+                futile = futility_value <= alpha
+                futility_counter = 'futility_prunes' if depth == 1 else 'extended_futility_prunes'
+
+        if depth == 1 and not self.quiescence and self.batch_evaluator is not None:
+            return self.evaluate_frontier(key, alpha, beta, ply, hash_move)
+
+        moves = self.order_moves(self.get_legal_moves(color), ply, hash_move)
+        if not moves:
+            return self.score_without_moves(ply)
+
+        alpha_original = alpha
+        best_value = float('-inf')
+        best_move = None
+        moves_searched = 0
+        reduce_late_moves = self.late_move_reductions and depth >= LATE_MOVE_MIN_DEPTH and not in_check
+
+        for index, move in enumerate(moves):
+            quiet = (futile or (reduce_late_moves and index >= LATE_MOVE_INDEX)) and self.is_quiet(move)
+            self.board.make_move(move)
+            if quiet and self.game_rules.is_in_check(opponent):
+                quiet = False
+            if quiet and futile:
+                self.board.unmake_move()
+                self.search_stats[futility_counter] += 1
+                best_value = max(best_value, futility_value)
+                continue
+
+            if moves_searched == 0:
+                value = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            else:
+                # zero window probe, one ply shallower for late quiet moves, re-searched when it fails high
+                if quiet:
+                    self.search_stats['reductions'] += 1
+                    value = -self.negamax(depth - 2, -alpha - 1, -alpha, ply + 1)
+                    if value > alpha:
+                        self.search_stats['re_searches'] += 1
+                if not quiet or value > alpha:
+                    value = -self.negamax(depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < value < beta:
+                    value = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            self.board.unmake_move()
+            moves_searched += 1
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self.record_cutoff(move, index, depth, ply)
+                break
+
+        if best_value <= alpha_original:
+            bound = UPPER_BOUND
+        elif best_value >= beta:
+            bound = LOWER_BOUND
         else:
-            min_eval = float('inf')
-            pieces = [p for p in self.board.pieces if p.color == 'black']
-            
-            for piece in pieces:
-                possible_moves = piece.get_possible_moves(self.board)
-                for move in possible_moves:
-                    if self.game_rules.is_move_legal(piece, move):
-                        old_pos = piece.position
-                        captured_piece = self.board.get_piece_at(move)
-                        if captured_piece:
-                            self.board.pieces.remove(captured_piece)
-                        piece.position = move
-                        
-                        eval = self.minimax(depth - 1, alpha, beta, True)
-                        min_eval = min(min_eval, eval)
-                        beta = min(beta, eval)
-                        
-                        piece.position = old_pos
-                        if captured_piece:
-                            self.board.pieces.append(captured_piece)
-                        
-                        if beta <= alpha:
-                            break
-                            
-            return min_eval
+            bound = EXACT
+        self.transposition_table.store(key, depth, score_to_table(best_value, ply), bound,
+                                       encode_move(best_move) if best_move else NO_MOVE)
+        return best_value
+
+    def is_draw_by_rule(self):
+        # a repeated position can be repeated again, so the search scores its first recurrence as a draw
+        return self.board.halfmove_clock >= FIFTY_MOVE_PLIES or self.board.repetition_count(1) > 0
+
+    def score_without_moves(self, ply):
+        # checkmate, sooner mates scoring further from zero, or stalemate, a draw
+        return -MATE_SCORE + ply if self.game_rules.is_in_check(self.board.turn) else 0
+
+    def evaluate_frontier(self, key, alpha, beta, ply, hash_move):
+        # a depth 1 node whose children are all static leaves: score them in one batch instead of one by one
+        moves = self.order_moves(self.get_legal_moves(self.board.turn), ply, hash_move)
+        if not moves:
+            return self.score_without_moves(ply)
+        self.nodes += len(moves)
+        self.check_budget()
+        scores = self.batch_evaluator.evaluate(encode_children(encode_position(self.board), moves)).tolist()
+        # pawn structure only changes with pawn moves and pawn captures
+        pawn_value = self.evaluate_pawn_structure()
+        squares = self.board.squares
+        # a child can only repeat a position or reach the 50-move limit after four reversible plies
+        may_draw = self.board.halfmove_clock >= 3
+        for index, move in enumerate(moves):
+            row, col = move[1]
+            target = squares[row * 8 + col]
+            if move[0].type == 'pawn' or (target is not None and target.type == 'pawn'):
+                self.board.make_move(move)
+                scores[index] += self.evaluate_pawn_structure()
+                self.board.unmake_move()
+            else:
+                scores[index] += pawn_value
+                if may_draw and target is None:
+                    # scored like negamax scores the child: a draw by rule is 0, whatever the material
+                    self.board.make_move(move)
+                    if self.is_draw_by_rule():
+                        self.search_stats['repetition_draws'] += 1
+                        scores[index] = 0
+                    self.board.unmake_move()
+        values = scores if self.board.turn == 'white' else [-score for score in scores]
+
+        best_value = max(values)
+        best_move = moves[values.index(best_value)]
+        if best_value >= beta:
+            index = next(index for index, value in enumerate(values) if value >= beta)
+            self.record_cutoff(moves[index], index, 1, ply)
+            bound = LOWER_BOUND
+        elif best_value <= alpha:
+            bound = UPPER_BOUND
+        else:
+            bound = EXACT
+        self.transposition_table.store(key, 1, score_to_table(best_value, ply), bound, encode_move(best_move))
+        return best_value
+
+    def quiescence_search(self, alpha, beta, ply):
+        # captures only, so leaves are never scored in the middle of an exchange
+        stand_pat = self.evaluate_side_to_move()
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best_value = stand_pat
+        # a capture that cannot lift the score above alpha even with this margin is skipped
+        delta_margin = 2 * self.piece_values['pawn']
+        squares = self.board.squares
+
+        for move in self.order_moves(self.get_legal_captures(self.board.turn), ply, NO_MOVE):
+            row, col = move[1]
+            if stand_pat + self.piece_values[squares[row * 8 + col].type] + delta_margin <= alpha:
+                continue
+            self.nodes += 1
+            self.check_budget()
+            self.board.make_move(move)
+            value = -self.quiescence_search(-beta, -alpha, ply + 1)
+            self.board.unmake_move()
+
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        return best_value
+
+    def evaluate_side_to_move(self):
+        score = self.evaluate_position()
+        return score if self.board.turn == 'white' else -score
 
     def evaluate_position(self):
+        key = self.board.hash
+        score = self.eval_cache.probe(key)
+        if score is None:
+            score = self.board.score if self.incremental_eval else self.compute_evaluation()
+            score += self.evaluate_pawn_structure()
+            self.eval_cache.store(key, score)
+        return score
+
+    def evaluate_pawn_structure(self):
+        key = self.board.pawn_hash
+        score = self.pawn_cache.probe(key)
+        if score is None:
+            white_pawns = self.board.bitboards['white']['pawn']
+            black_pawns = self.board.bitboards['black']['pawn']
+            score = (self.get_pawn_structure_value(white_pawns, black_pawns, 'white') -
+                     self.get_pawn_structure_value(black_pawns, white_pawns, 'black'))
+            self.pawn_cache.store(key, score)
+        return score
+
+    def get_pawn_structure_value(self, pawns, enemy_pawns, color):
+        value = 0
+        for col in range(8):
+            count = bin(pawns & FILES[col]).count('1')
+            if count > 1:
+                value -= DOUBLED_PAWN_PENALTY * (count - 1)
+            if count and not pawns & ADJACENT_FILES[col]:
+                value -= ISOLATED_PAWN_PENALTY * count
+        for square in iter_squares(pawns):
+            if not PASSED_PAWN_MASKS[color][square] & enemy_pawns:
+                row = square >> 3
+                value += PASSED_PAWN_BONUS[row if color == 'white' else 7 - row]
+        return value
+
+    def compute_evaluation(self):
+        # full per-piece recompute of material and position, the non-incremental path
         total_eval = 0
         
         for piece in self.board.pieces:
@@ -210,16 +826,4 @@ class ChessAI:
     
     def get_position_value(self, piece):
         row, col = piece.position
-        if piece.color == 'black':
-            row = 7 - row  # Flip the table for black pieces
-            
-        position_tables = {
-            'pawn': self.pawn_table,
-            'knight': self.knight_table,
-            'bishop': self.bishop_table,
-            'rook': self.rook_table,
-            'queen': self.queen_table,
-            'king': self.king_table
-        }
-        
-        return position_tables[piece.type][row][col]
\ No newline at end of file
+        return self.position_tables[piece.color][piece.type][row * 8 + col]
\ No newline at end of file
@@ -1,7 +1,8 @@
 import pygame
-from piece2 import Rook, Knight, Bishop, Queen, King, Pawn
+from position import Position
+from piece2 import Pawn
 
-class ChessBoard:
+class ChessBoard(Position):
     def __init__(self, screen, width, height):
      
         self.screen = screen
@@ -15,37 +16,7 @@ class ChessBoard:
 
         self.pieces_image = pygame.image.load('Pieces/ChessPiecesArray.png').convert_alpha()
         self.piece_size = self.pieces_image.get_height() // 2
-
-        self.pieces = self.initialize_pieces()
-
-    def initialize_pieces(self):
-        pieces = []
-        white_positions = {
-            Rook: [(0, 0), (0, 7)],
-            Knight: [(0, 1), (0, 6)],
-            Bishop: [(0, 2), (0, 5)],
-            Queen: [(0, 3)],
-            King: [(0, 4)],
-            Pawn: [(1, col) for col in range(8)]
-        }
-        black_positions = {
-            Rook: [(7, 0), (7, 7)],
-            Knight: [(7, 1), (7, 6)],
-            Bishop: [(7, 2), (7, 5)],
-            Queen: [(7, 3)],
-            King: [(7, 4)],
-            Pawn: [(6, col) for col in range(8)]
-        }
-        for piece_class, positions in white_positions.items():
-            for position in positions:
-                piece_image = self.get_piece_image(piece_class.__name__.lower(), 'white')
-                pieces.append(piece_class(self.screen, piece_image, 'white', position))
-        # black piece init
-        for piece_class, positions in black_positions.items():
-            for position in positions:
-                piece_image = self.get_piece_image(piece_class.__name__.lower(), 'black')
-                pieces.append(piece_class(self.screen, piece_image, 'black', position))
-        return pieces
+        super().__init__()
 
     def get_piece_image(self, piece_name, color):
         row = 0 if color == 'white' else 1
@@ -83,7 +54,7 @@ class ChessBoard:
 
     def draw_pieces(self):
         for piece in self.pieces:
-            piece.draw(self.tile_size, self.board_offset_x, self.board_offset_y)
+            self.draw_piece(piece)
             
             if isinstance(piece, Pawn):
                 if ((piece.color == 'white' and piece.position[0] == 6) or 
@@ -93,27 +64,18 @@ class ChessBoard:
                     pygame.draw.rect(self.screen, (255, 0, 0), 
                                 (x, y, self.tile_size, self.tile_size), 2)
 
-    def get_piece_at(self, position):
-        for piece in self.pieces:
-            if piece.position == position:
-                return piece
-        return None
-
-    def move_piece(self, piece, new_position):
-        if piece and piece.move(new_position, self):
-            return True
-        return False
-    
-    def is_empty_square(self, row, col):
-        return self.get_piece_at((row, col)) is None
+    def draw_piece(self, piece):
+        x = self.board_offset_x + piece.position[1] * self.tile_size
+        y = self.board_offset_y + piece.position[0] * self.tile_size
+        self.screen.blit(self.get_piece_image(piece.type, piece.color), (x, y))
 
-    def is_opponent_piece(self, row, col, current_color):
-        piece = self.get_piece_at((row, col))
-        return piece is not None and piece.color != current_color
-    
-    def draw_possible_moves(self, piece):
+    def draw_possible_moves(self, piece, legal_moves=None):
+        # legal_moves is the per-turn map of GameStatus, without it the pseudo-legal moves are shown
         if piece:
-            possible_moves = piece.get_possible_moves(self)
+            if legal_moves is not None:
+                possible_moves = legal_moves.get(piece, ())
+            else:
+                possible_moves = piece.get_possible_moves(self)
             highlight_color = (124, 252, 0, 128)
             surface = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
             pygame.draw.rect(surface, highlight_color, surface.get_rect())
@@ -127,25 +89,3 @@ class ChessBoard:
         tile_x = (position[0] - self.board_offset_x) // self.tile_size
         tile_y = (position[1] - self.board_offset_y) // self.tile_size
         return (tile_y, tile_x)
-    
-    def get_pieces_by_color(self, color):
-        return [piece for piece in self.pieces if piece.color == color]
-    
-    def find_king(self, color):
-        for piece in self.pieces:
-            if isinstance(piece, King) and piece.color == color:
-                return piece
-        return None
-
-    def create_piece(self, piece_type, color, position):
-        piece_classes = {
-            'rook': Rook,
-            'knight': Knight,
-            'bishop': Bishop,
-            'queen': Queen,
-            'king': King,
-            'pawn': Pawn
-        }
-        piece_class = piece_classes[piece_type]
-        piece_image = self.get_piece_image(piece_type, color)
-        return piece_class(self.screen, piece_image, color, position)
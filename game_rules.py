@@ -1,76 +1,165 @@
-from piece2 import King
+from bitboard import FULL, ROOK_RAYS, BISHOP_RAYS, iter_squares
+from position import FIFTY_MOVE_PLIES
+
+
+class GameStatus:
+    """
+    Everything the UI shows about one position, computed once when the position changes.
+
+    legal_moves maps each piece of the side to move to its legal destinations.
+    """
+
+    def __init__(self, game_rules):
+        board = game_rules.board
+        # legal_moves holds piece objects, so a reload of the same position needs a new status
+        self.key = (board.hash, board.setups)
+        self.turn = board.turn
+        self.legal_moves = {}
+        for piece, destination in game_rules.legal_moves(self.turn):
+            self.legal_moves.setdefault(piece, []).append(destination)
+        self.in_check = game_rules.is_in_check(self.turn)
+        self.checkers = game_rules.get_checkers(self.turn) if self.in_check else []
+        self.result = game_rules.get_result(bool(self.legal_moves), self.in_check)
+
 
 class GameRules:
     def __init__(self, board):
         self.board = board
-        self.current_turn = 'black'
-        #invert colours
         self.move_history = []
+        self.status = None
+
+    # the side to move lives on the board so make/unmake and the position hash track it
+    @property
+    def current_turn(self):
+        return self.board.turn
+
+    @current_turn.setter
+    def current_turn(self, color):
+        self.board.set_turn(color)
 
     def switch_turn(self):
         self.current_turn = 'black' if self.current_turn == 'white' else 'white'
 
     def is_in_check(self, color):
-        
-        king = next((piece for piece in self.board.pieces if isinstance(piece, King) and piece.color == color), None)
+        king = self.board.bitboards[color]['king']
         if not king:
             return False
 
-        king_pos = king.position
-        opponent_pieces = [p for p in self.board.pieces if p.color != color]
-
-        for piece in opponent_pieces:
-            if king_pos in piece.get_possible_moves(self.board):
-                return True
-        return False
-
-    def is_move_legal(self, piece, destination):
-        initial_position = piece.position
-        target_piece = self.board.get_piece_at(destination)
-        
-        piece.position = destination
-        if target_piece:
-            self.board.pieces.remove(target_piece)
-        
-        in_check = self.is_in_check(piece.color)
-        
-        piece.position = initial_position
-        if target_piece:
-            self.board.pieces.append(target_piece)
-        
-        return not in_check
+        opponent = 'black' if color == 'white' else 'white'
+        return self.board.is_square_attacked(king.bit_length() - 1, opponent)
 
-    def is_checkmate(self, color):
-        if not self.is_in_check(color):
-            return False
+    def get_checkers(self, color):
+        king = self.board.bitboards[color]['king']
+        if not king:
+            return []
 
-        pieces = [p for p in self.board.pieces if p.color == color]
-        for piece in pieces:
-            possible_moves = piece.get_possible_moves(self.board)
-            for move in possible_moves:
-                if self.is_move_legal(piece, move):
-                    return False 
-        return True
+        opponent = 'black' if color == 'white' else 'white'
+        checkers = self.board.attackers_to(king.bit_length() - 1, opponent)
+        return [self.board.squares[square] for square in iter_squares(checkers)]
+
+    def legal_moves(self, color, captures_only=False):
+        return list(self.generate_legal_moves(color, captures_only))
+
+    def has_legal_move(self, color):
+        # stops at the first legal move instead of generating them all
+        return next(self.generate_legal_moves(color), None) is not None
+
+    def generate_legal_moves(self, color, captures_only=False):
+        """
+        Yields every legal (piece, destination) for color without playing any of them.
+
+        Checkers and pins are found once by walking the rays out of the king; other
+        pieces are then restricted to the squares that block or capture a single
+        checker and to their pin line. Only king moves test the destination for attacks.
+        """
+        board = self.board
+        squares = board.squares
+        opponent = 'black' if color == 'white' else 'white'
+        targets = board.occupancy[opponent] if captures_only else FULL
+
+        king_bitboard = board.bitboards[color]['king']
+        king_square = king_bitboard.bit_length() - 1 if king_bitboard else None
+        checkers = board.attackers_to(king_square, opponent) if king_bitboard else 0
+        # squares a non-king move has to land on: anywhere, or on the checker and the line to it
+        check_mask = checkers or FULL
+        # pinned piece square -> its pin line up to and including the pinning piece
+        pins = {}
+        if king_bitboard:
+            enemy = board.bitboards[opponent]
+            for rays, sliders in ((ROOK_RAYS, enemy['rook'] | enemy['queen']),
+                                  (BISHOP_RAYS, enemy['bishop'] | enemy['queen'])):
+                if not sliders:
+                    continue
+                for ray in rays[king_square]:
+                    line = 0
+                    blocker = None
+                    for target in ray:
+                        line |= 1 << target
+                        piece = squares[target]
+                        if piece is None:
+                            continue
+                        if piece.color == color:
+                            if blocker is not None:
+                                break
+                            blocker = target
+                            continue
+                        if sliders >> target & 1:
+                            if blocker is None:
+                                check_mask = line
+                            else:
+                                pins[blocker] = line
+                        break
+        double_check = checkers & (checkers - 1)
+
+        for square in iter_squares(board.occupancy[color]):
+            piece = squares[square]
+            if piece.type == 'king':
+                # lifted off its square so it cannot shelter behind itself on a checking line,
+                # and put back before anything is yielded
+                destinations = piece.get_possible_moves(board)
+                squares[square] = None
+                safe = [destination for destination in destinations
+                        if targets >> (destination[0] * 8 + destination[1]) & 1 and
+                        not board.is_square_attacked(destination[0] * 8 + destination[1], opponent)]
+                squares[square] = piece
+                for destination in safe:
+                    yield piece, destination
+                continue
+            if double_check:
+                continue
+            allowed = targets & check_mask & pins.get(square, FULL)
+            for destination in piece.get_possible_moves(board):
+                row, col = destination
+                if allowed >> (row * 8 + col) & 1:
+                    yield piece, destination
+
+    def is_checkmate(self, color):
+        return self.is_in_check(color) and not self.has_legal_move(color)
 
     def is_stalemate(self, color):
-        if self.is_in_check(color):
-            return False
+        return not self.is_in_check(color) and not self.has_legal_move(color)
 
-        pieces = [p for p in self.board.pieces if p.color == color]
-        for piece in pieces:
-            possible_moves = piece.get_possible_moves(self.board)
-            for move in possible_moves:
-                if self.is_move_legal(piece, move):
-                    return False 
-        return True
+    def get_status(self):
+        # cached per position, so asking again for an unchanged position costs nothing
+        if self.status is None or self.status.key != (self.board.hash, self.board.setups):
+            self.status = GameStatus(self)
+        return self.status
 
     def is_game_over(self):
-        if self.is_checkmate(self.current_turn):
+        return self.get_result(self.has_legal_move(self.current_turn), self.is_in_check(self.current_turn))
+
+    def get_result(self, has_moves, in_check):
+        # the result message for the side to move, None while the game goes on
+        if has_moves:
+            if self.board.halfmove_clock >= FIFTY_MOVE_PLIES:
+                return "Draw by the 50-move rule!"
+            if self.board.repetition_count() >= 2:
+                return "Draw by threefold repetition!"
+            return None
+        if in_check:
             # return f"Checkmate! {self.current_turn} wins."
             return f"Checkmate!"
-        elif self.is_stalemate(self.current_turn):
-            return "Stalemate!"
-        return None
+        return "Stalemate!"
     
     def position_to_notation(self, pos):
         column = chr(pos[1] + ord('a'))  # 'a' to 'h'
@@ -65,6 +65,7 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
     check_sound_played = False
     checkmate_sound_played = False
     stalemate_sound_played = False
+    draw_sound_played = False
 
     def draw_turn_indicator():
         sidebar_color = (0, 0, 0) if game_rules.current_turn == 'white' else (255, 255, 255)
@@ -72,12 +73,14 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
         pygame.draw.rect(screen, sidebar_color, (board_width, 0, sidebar_width, board_height))
 
     def update_game_status():
-        nonlocal check_sound_played, checkmate_sound_played, stalemate_sound_played
+        nonlocal check_sound_played, checkmate_sound_played, stalemate_sound_played, draw_sound_played
         current_player = game_rules.current_turn
         opponent = 'black' if current_player == 'white' else 'white'
         # swapped black with white and vice versa, invert colours here to go back.
 
-        game_over = game_rules.is_game_over()
+        # the status is cached per position, so reading it every frame generates nothing
+        game_status = game_rules.get_status()
+        game_over = game_status.result
         if game_over:
             if "Checkmate" in game_over and not checkmate_sound_played:
                 status_display.update_status(game_over, "checkmate", current_turn=current_player)
@@ -87,9 +90,13 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
                 status_display.update_status(game_over, "stalemate")
                 sound_manager.play_stalemate_sound()
                 stalemate_sound_played = True
+            elif "Draw" in game_over and not draw_sound_played:
+                status_display.update_status(game_over, "draw")
+                sound_manager.play_stalemate_sound()
+                draw_sound_played = True
             return
 
-        if game_rules.is_in_check(current_player) and not check_sound_played:
+        if game_status.in_check and not check_sound_played:
             checking_piece = None
             opponent_pieces = chess_board.get_pieces_by_color(opponent)
             king_position = chess_board.find_king(current_player).position
@@ -119,9 +126,15 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
             check_sound_played = True
 
     def handle_move(selected_piece, final_position):
-        nonlocal check_sound_played, checkmate_sound_played, stalemate_sound_played
-        if game_rules.is_move_legal(selected_piece, final_position) and chess_board.move_piece(selected_piece, final_position):
-            current_player = game_rules.current_turn
+        nonlocal check_sound_played, checkmate_sound_played, stalemate_sound_played, draw_sound_played
+        # read the mover first, making the move hands the turn to the opponent
+        current_player = game_rules.current_turn
+        game_status = game_rules.get_status()
+        # a drawn position still has legal moves, the result alone ends the game
+        if game_status.result:
+            return False
+        legal_destinations = game_status.legal_moves.get(selected_piece, ())
+        if final_position in legal_destinations and chess_board.move_piece(selected_piece, final_position):
             opponent = 'black' if current_player == 'white' else 'white'
             # swapped black with white and vice versa, invert colours here to go back.
 
@@ -133,7 +146,7 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
                 captured_piece
             )
 
-            game_over = game_rules.is_game_over()
+            game_over = game_rules.get_status().result
             if game_over:
                 if "Checkmate" in game_over and not checkmate_sound_played:
                     status_display.update_status(game_over, "checkmate", current_turn=current_player)
@@ -143,6 +156,10 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
                     status_display.update_status(game_over, "stalemate")
                     sound_manager.play_stalemate_sound()
                     stalemate_sound_played = True
+                elif "Draw" in game_over and not draw_sound_played:
+                    status_display.update_status(game_over, "draw")
+                    sound_manager.play_stalemate_sound()
+                    draw_sound_played = True
                 return True
 
             if game_rules.is_in_check(current_player) and not check_sound_played:
@@ -178,105 +195,105 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
             else:
                 check_sound_played = False
 
-            game_rules.switch_turn()
             sound_manager.play_move_sound()
             check_sound_played = False
             checkmate_sound_played = False
             stalemate_sound_played = False
+            draw_sound_played = False
             return True
         return False
 
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-
-        current_turn = game_rules.current_turn
-        current_ai = ai_black if current_turn == 'white' else ai_white
-
-        if game_mode in ['Human_vs_AI', 'AI_vs_AI'] and current_ai:
-            if not ai_move_ready.is_set():
-                threading.Thread(target=calculate_ai_move, args=(current_ai, current_turn)).start()
-
-            ai_move_ready.wait()
-            with turn_lock:
-                best_move = ai_move_results[current_turn]
-                if best_move:
-                    piece, new_position = best_move
-                    handle_move(piece, new_position)
-                    ai_move_ready.clear()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if game_mode == 'AI_vs_AI':
-                    continue
-                menu_action = game_menu.handle_click(mouse_pos)
-                if menu_action:
-                    if menu_action == 'resume':
-                        game_menu.menu_open = False
-                    elif menu_action == 'save_game':
-                        if save_game(chess_board, game_rules, game_mode):
-                            popup = Popup(screen, "Game saved successfully!")
-                            popup.show()
-                        else:
-                            popup = Popup(screen, "Failed to save game!")
-                            popup.show()
-                    elif menu_action == 'load_game':
-                        if load_game(chess_board, game_rules, game_mode):
-                            popup = Popup(screen, "Game loaded successfully!")
-                            popup.show()
-                        else:
-                            popup = Popup(screen, "Failed to load game!")
-                            popup.show()
-                    elif menu_action == 'main_menu':
-                        return
-                    continue
-
-                if not game_menu.menu_open:
-                    position = pygame.mouse.get_pos()
-                    tile_position = chess_board.handle_click(position)
-                    piece = chess_board.get_piece_at(tile_position) if tile_position else None
-
-                    if selected_piece is None:
-                        if piece and piece.color == game_rules.current_turn:
-                            selected_piece = piece
-                    else:
-                        if handle_move(selected_piece, tile_position):
-                            selected_piece = None
+    try:
+        while running:
+            mouse_pos = pygame.mouse.get_pos()
+
+            current_turn = game_rules.current_turn
+            current_ai = ai_black if current_turn == 'white' else ai_white
+
+            if game_mode in ['Human_vs_AI', 'AI_vs_AI'] and current_ai and not game_rules.get_status().result:
+                if not ai_move_ready.is_set():
+                    threading.Thread(target=calculate_ai_move, args=(current_ai, current_turn)).start()
+
+                ai_move_ready.wait()
+                with turn_lock:
+                    best_move = ai_move_results[current_turn]
+                    if best_move:
+                        piece, new_position = best_move
+                        handle_move(piece, new_position)
+                        ai_move_ready.clear()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if game_mode == 'AI_vs_AI':
+                        continue
+                    menu_action = game_menu.handle_click(mouse_pos)
+                    if menu_action:
+                        if menu_action == 'resume':
+                            game_menu.menu_open = False
+                        elif menu_action == 'save_game':
+                            if save_game(chess_board, game_rules, game_mode):
+                                popup = Popup(screen, "Game saved successfully!")
+                                popup.show()
+                            else:
+                                popup = Popup(screen, "Failed to save game!")
+                                popup.show()
+                        elif menu_action == 'load_game':
+                            if load_game(chess_board, game_rules, game_mode):
+                                popup = Popup(screen, "Game loaded successfully!")
+                                popup.show()
+                            else:
+                                popup = Popup(screen, "Failed to load game!")
+                                popup.show()
+                        elif menu_action == 'main_menu':
+                            return
+                        continue
+
+                    if not game_menu.menu_open:
+                        position = pygame.mouse.get_pos()
+                        tile_position = chess_board.handle_click(position)
+                        piece = chess_board.get_piece_at(tile_position) if tile_position else None
+
+                        if selected_piece is None:
+                            if piece and piece.color == game_rules.current_turn:
+                                selected_piece = piece
                         else:
-                            selected_piece = piece if piece and piece.color == game_rules.current_turn else None
+                            if handle_move(selected_piece, tile_position):
+                                selected_piece = None
+                            else:
+                                selected_piece = piece if piece and piece.color == game_rules.current_turn else None
 
-        screen.fill((255, 255, 255))
-        chess_board.construct_board()
+            screen.fill((255, 255, 255))
+            chess_board.construct_board()
 
-        if selected_piece:
-            x = chess_board.board_offset_x + selected_piece.position[1] * chess_board.tile_size
-            y = chess_board.board_offset_y + selected_piece.position[0] * chess_board.tile_size
-            pygame.draw.rect(screen, (255, 255, 0), (x, y, chess_board.tile_size, chess_board.tile_size), 3)
+            if selected_piece:
+                x = chess_board.board_offset_x + selected_piece.position[1] * chess_board.tile_size
+                y = chess_board.board_offset_y + selected_piece.position[0] * chess_board.tile_size
+                pygame.draw.rect(screen, (255, 255, 0), (x, y, chess_board.tile_size, chess_board.tile_size), 3)
 
-            possible_moves = selected_piece.get_possible_moves(chess_board)
-            for move in possible_moves:
-                move_x = chess_board.board_offset_x + move[1] * chess_board.tile_size
-                move_y = chess_board.board_offset_y + move[0] * chess_board.tile_size
-                highlight_surface = pygame.Surface((chess_board.tile_size, chess_board.tile_size), pygame.SRCALPHA)
-                pygame.draw.rect(highlight_surface, (0, 255, 0, 128), highlight_surface.get_rect())
-                screen.blit(highlight_surface, (move_x, move_y))
+                chess_board.draw_possible_moves(selected_piece, game_rules.get_status().legal_moves)
 
-        chess_board.draw_pieces()
+            chess_board.draw_pieces()
 
-        draw_turn_indicator()
-        update_game_status()
-        status_display.draw_move_history(screen, game_rules.move_history)
-        status_display.draw(screen)
-        game_menu.draw_menu(screen)
+            draw_turn_indicator()
+            update_game_status()
+            status_display.draw_move_history(screen, game_rules.move_history)
+            status_display.draw(screen)
+            game_menu.draw_menu(screen)
 
-        if popup:
-            if not popup.draw():
-                popup = None
+            if popup:
+                if not popup.draw():
+                    popup = None
 
-        pygame.display.flip()
-        clock.tick(60)
+            pygame.display.flip()
+            clock.tick(60)
+    finally:
+        # stop worker pools and release shared tables however the game ends
+        for ai in (ai_white, ai_black):
+            if ai:
+                ai.close()
 
 def save_game(chess_board, game_rules, game_mode, file_name="saved_game.pkl"):
     try:
@@ -300,10 +317,7 @@ def load_game(chess_board, game_rules, current_game_mode, file_name="saved_game.
             if saved_game_mode != current_game_mode:
                 return False  
 
-            chess_board.pieces = [
-                chess_board.create_piece(piece_type, color, position)
-                for piece_type, color, position in game_state['board']
-            ]
+            chess_board.load_pieces(game_state['board'])
             game_rules.current_turn = game_state['current_turn']
             return True
     except FileNotFoundError:
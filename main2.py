@@ -73,7 +73,8 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager):
                status_display.update_status(game_over, "stalemate")
 
     def handle_move(selected_piece, final_position):
-        if game_rules.is_move_legal(selected_piece, final_position) and chess_board.move_piece(selected_piece, final_position):
+        legal_destinations = game_rules.get_status().legal_moves.get(selected_piece, ())
+        if final_position in legal_destinations and chess_board.move_piece(selected_piece, final_position):
             if game_rules.is_in_check(game_rules.current_turn):
                 status_display.update_status(f"{game_rules.current_turn.capitalize()} is in Check!", "check")
                 sound_manager.play_check_sound()
@@ -7,8 +7,18 @@ from ui.start_menu import StartMenu
 from ui.game_menu import GameMenu
 from ui.status_display import StatusDisplay
 from chess_ai import ChessAI
+from search_cache import SearchCache
 import pickle
 
+# set to True to check the incremental position hash and score against a full recompute after every move in AI vs AI games
+DEBUG_INCREMENTAL = False
+# seconds an AI may think per move; it deepens up to its depth until this runs out
+AI_TIME_LIMIT = 3.0
+# processes each AI splits its root moves over; 1 searches in the game process
+AI_WORKERS = 1
+# file for search results kept across games and restarts, e.g. "search_cache.bin"; None disables it
+AI_SEARCH_CACHE = None
+
 def save_game(chess_board, game_rules, game_mode, file_name="saved_game.pkl"):
     """
     Save the current game state to a file.
@@ -37,10 +47,7 @@ def load_game(chess_board, game_rules, current_game_mode, file_name="saved_game.
                 return False  # Indicate loading failure
 
             # Load the game state
-            chess_board.pieces = [
-                chess_board.create_piece(piece_type, color, position)
-                for piece_type, color, position in game_state['board']
-            ]
+            chess_board.load_pieces(game_state['board'])
             game_rules.current_turn = game_state['current_turn']
             return True  # Indicate loading success
     except FileNotFoundError:
@@ -81,6 +88,7 @@ import time
 def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, game_mode='Human_vs_Human'):
     board_width = screen_width - sidebar_width
     chess_board = ChessBoard(screen, board_width, board_height)
+    chess_board.verify_hash = chess_board.verify_score = DEBUG_INCREMENTAL and game_mode == 'AI_vs_AI'
     game_rules = GameRules(chess_board)
     game_menu = GameMenu(screen_width, board_height, sidebar_width)
     clock = pygame.time.Clock()
@@ -90,9 +98,12 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
     dragging = False
     initial_position = None
 
-    # Initialize AIs
-    ai_white = ChessAI(chess_board, game_rules, depth=3) if game_mode == 'AI_vs_AI' else None
-    ai_black = ChessAI(chess_board, game_rules, depth=3) if game_mode in ['Human_vs_AI', 'AI_vs_AI'] else None
+    # Initialize AIs, both sharing one search cache
+    search_cache = SearchCache(AI_SEARCH_CACHE) if AI_SEARCH_CACHE else None
+    ai_white = ChessAI(chess_board, game_rules, depth=3, time_limit=AI_TIME_LIMIT, workers=AI_WORKERS,
+                       search_cache=search_cache) if game_mode == 'AI_vs_AI' else None
+    ai_black = ChessAI(chess_board, game_rules, depth=3, time_limit=AI_TIME_LIMIT, workers=AI_WORKERS,
+                       search_cache=search_cache) if game_mode in ['Human_vs_AI', 'AI_vs_AI'] else None
 
     # Synchronization variables
     ai_move_results = {'white': None, 'black': None}
@@ -114,62 +125,32 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
         sidebar_color = (0, 0, 0) if game_rules.current_turn == 'black' else (255, 255, 255)
         pygame.draw.rect(screen, sidebar_color, (board_width, 0, sidebar_width, board_height))
 
-    def update_game_status():
-     current_player = game_rules.current_turn
-     opponent = 'white' if current_player == 'black' else 'black'
-
-    # Check for game over first
-     game_over = game_rules.is_game_over()
-     if game_over:
-        if "Checkmate" in game_over:
-            status_display.update_status(game_over, "checkmate")
-            sound_manager.play_checkmate_sound()
-        elif "Stalemate" in game_over:
-            status_display.update_status(game_over, "stalemate")
-            sound_manager.play_move_sound()
-        return  # Exit early to avoid overriding game-over status
-
-    # Check for "Check" status
-     if game_rules.is_in_check(current_player):
-        checking_piece = None
-        opponent_pieces = chess_board.get_pieces_by_color(opponent)
-        king_position = chess_board.find_king(current_player).position
-
-        for piece in opponent_pieces:
-            if king_position in piece.get_possible_moves(chess_board):
-                checking_piece = f"{opponent.capitalize()}'s {piece.__class__.__name__}"
-                break
-
-        status_display.update_status(
-            f"{current_player.capitalize()} is in Check!",
-            "check",
-            checking_piece
-        )
+    # check state, result and legal moves of the current position, refreshed only when it changes
+    game_status = game_rules.get_status()
 
-     current_player = game_rules.current_turn
+    def update_game_status():
+     # reads the cached status only, nothing is generated per frame
+     current_player = game_status.turn
      opponent = 'white' if current_player == 'black' else 'black'
 
     # Check for game over first
-     game_over = game_rules.is_game_over()
+     game_over = game_status.result
      if game_over:
         if "Checkmate" in game_over:
-            status_display.update_status(game_over, "checkmate")
-            sound_manager.play_checkmate_sound()
+            # the side to move is mated, the status panel names the winner
+            status_display.update_status(game_over, "checkmate", current_turn=opponent)
         elif "Stalemate" in game_over:
             status_display.update_status(game_over, "stalemate")
-            sound_manager.play_move_sound()
+        elif "Draw" in game_over:
+            status_display.update_status(game_over, "draw")
         return  # Exit early to avoid overriding game-over status
 
     # Check for "Check" status
-     if game_rules.is_in_check(current_player):
+     if game_status.in_check:
         checking_piece = None
-        opponent_pieces = chess_board.get_pieces_by_color(opponent)
-        king_position = chess_board.find_king(current_player).position
-
-        for piece in opponent_pieces:
-            if king_position in piece.get_possible_moves(chess_board):
-                checking_piece = f"{opponent.capitalize()}'s {piece.__class__.__name__}"
-                break
+        checkers = game_status.checkers
+        if checkers:
+            checking_piece = f"{opponent.capitalize()}'s {checkers[0].__class__.__name__}"
 
         status_display.update_status(
             f"{current_player.capitalize()} is in Check!",
@@ -179,40 +160,26 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
 
     
     def handle_move(selected_piece, final_position):
-     if game_rules.is_move_legal(selected_piece, final_position) and chess_board.move_piece(selected_piece, final_position):
-        current_player = game_rules.current_turn
-        opponent = 'white' if current_player == 'black' else 'black'
+     nonlocal game_status
+     # a drawn position still has legal moves, the result alone ends the game
+     if game_status.result:
+        return False
+     legal_destinations = game_status.legal_moves.get(selected_piece, ())
+     if final_position in legal_destinations and chess_board.move_piece(selected_piece, final_position):
+        game_status = game_rules.get_status()
 
         # Check if the game is over first
-        game_over = game_rules.is_game_over()
+        game_over = game_status.result
         if game_over:
             if "Checkmate" in game_over:
-                status_display.update_status(game_over, "checkmate")
                 sound_manager.play_checkmate_sound()
-            elif "Stalemate" in game_over:
-                status_display.update_status(game_over, "stalemate")
+            elif "Stalemate" in game_over or "Draw" in game_over:
                 sound_manager.play_move_sound()
             return True
 
-        # Check for "Check" status
-        if game_rules.is_in_check(current_player):
-            checking_piece = None
-            opponent_pieces = chess_board.get_pieces_by_color(opponent)
-            king_position = chess_board.find_king(current_player).position
-
-            for piece in opponent_pieces:
-                if king_position in piece.get_possible_moves(chess_board):
-                    checking_piece = f"{opponent.capitalize()}'s {piece.__class__.__name__}"
-                    break
-
-            status_display.update_status(
-                f"{current_player.capitalize()} is in Check!",
-                "check",
-                checking_piece
-            )
+        if game_status.in_check:
             sound_manager.play_check_sound()
 
-        game_rules.switch_turn()
         sound_manager.play_move_sound()
         return True
      return False
@@ -254,120 +221,124 @@ def run_game(screen, screen_width, board_height, sidebar_width, sound_manager, g
     #     return True
     #  return False
     
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-
-        # Handle AI turns
-        current_turn = game_rules.current_turn
-        current_ai = ai_white if current_turn == 'white' else ai_black
-
-        if game_mode in ['Human_vs_AI', 'AI_vs_AI'] and current_ai:
-            if not ai_move_ready.is_set():
-                threading.Thread(target=calculate_ai_move, args=(current_ai, current_turn)).start()
-
-            # Wait for AI move
-            ai_move_ready.wait()
-            with turn_lock:
-                best_move = ai_move_results[current_turn]
-                if best_move:
-                    piece, new_position = best_move
-                    handle_move(piece, new_position)
-                    ai_move_ready.clear()
-                    # pygame.time.wait(500)  # Add delay for visibility
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if game_mode == 'AI_vs_AI':
-                    continue
-                menu_action = game_menu.handle_click(mouse_pos)
-                if menu_action:
-                    if menu_action == 'resume':
-                        game_menu.menu_open = False
-                    elif menu_action == 'save_game':
-                        save_game(chess_board, game_rules, game_mode)
-                        print("Game saved successfully!")  # Debug message or feedback
-                    elif menu_action == 'load_game':
-                        success = load_game(chess_board, game_rules, game_mode)
-                        if success:
-                            print("Game loaded successfully!")
-                        else:
-                            print("Failed to load game!")
-                    elif menu_action == 'main_menu':
-                        return
-                    continue
-
-                if not game_menu.menu_open:
-                    position = pygame.mouse.get_pos()
-                    tile_position = chess_board.handle_click(position)
-                    piece = chess_board.get_piece_at(tile_position) if tile_position else None
-
-                    if selected_piece is None:
-                        if piece and piece.color == game_rules.current_turn:
-                            selected_piece = piece
-                            initial_position = piece.position
-                            dragging = True
-                    else:
-                        if handle_move(selected_piece, tile_position):
-                            selected_piece = None
-                        elif piece and piece.color == game_rules.current_turn:
-                            selected_piece = piece
+    try:
+        while running:
+            mouse_pos = pygame.mouse.get_pos()
+
+            # Handle AI turns
+            current_turn = game_rules.current_turn
+            current_ai = ai_white if current_turn == 'white' else ai_black
+
+            if game_mode in ['Human_vs_AI', 'AI_vs_AI'] and current_ai and not game_status.result:
+                if not ai_move_ready.is_set():
+                    threading.Thread(target=calculate_ai_move, args=(current_ai, current_turn)).start()
+
+                # Wait for AI move
+                ai_move_ready.wait()
+                with turn_lock:
+                    best_move = ai_move_results[current_turn]
+                    if best_move:
+                        piece, new_position = best_move
+                        handle_move(piece, new_position)
+                        ai_move_ready.clear()
+                        # pygame.time.wait(500)  # Add delay for visibility
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if game_mode == 'AI_vs_AI':
+                        continue
+                    menu_action = game_menu.handle_click(mouse_pos)
+                    if menu_action:
+                        if menu_action == 'resume':
+                            game_menu.menu_open = False
+                        elif menu_action == 'save_game':
+                            save_game(chess_board, game_rules, game_mode)
+                            print("Game saved successfully!")  # Debug message or feedback
+                        elif menu_action == 'load_game':
+                            success = load_game(chess_board, game_rules, game_mode)
+                            if success:
+                                game_status = game_rules.get_status()
+                                print("Game loaded successfully!")
+                            else:
+                                print("Failed to load game!")
+                        elif menu_action == 'main_menu':
+                            return
+                        continue
+
+                    if not game_menu.menu_open:
+                        position = pygame.mouse.get_pos()
+                        tile_position = chess_board.handle_click(position)
+                        piece = chess_board.get_piece_at(tile_position) if tile_position else None
+
+                        if selected_piece is None:
+                            if piece and piece.color == game_rules.current_turn:
+                                selected_piece = piece
+                                initial_position = piece.position
+                                dragging = True
                         else:
-                            selected_piece = None
-
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if selected_piece and dragging and not game_menu.menu_open:
-                    final_position = chess_board.handle_click(mouse_pos)
-                    handle_move(selected_piece, final_position)
-                    selected_piece = None
-                    dragging = False
-                    initial_position = None
-
-        # Clear screen for redraw
-        screen.fill((255, 255, 255))
-        chess_board.construct_board()
-
-        # Highlight selected piece and possible moves
-        if selected_piece:
-            x = chess_board.board_offset_x + selected_piece.position[1] * chess_board.tile_size
-            y = chess_board.board_offset_y + selected_piece.position[0] * chess_board.tile_size
-            pygame.draw.rect(screen, (255, 255, 0), (x, y, chess_board.tile_size, chess_board.tile_size), 3)
-
-            possible_moves = selected_piece.get_possible_moves(chess_board)
-            for move in possible_moves:
-                move_x = chess_board.board_offset_x + move[1] * chess_board.tile_size
-                move_y = chess_board.board_offset_y + move[0] * chess_board.tile_size
-                highlight_surface = pygame.Surface((chess_board.tile_size, chess_board.tile_size), pygame.SRCALPHA)
-                pygame.draw.rect(highlight_surface, (0, 255, 0, 128), highlight_surface.get_rect())
-                screen.blit(highlight_surface, (move_x, move_y))
-
-        # Draw all pieces except the one currently being dragged
-        for piece in chess_board.pieces:
-            if piece != selected_piece or not dragging:
-                piece.draw(chess_board.tile_size, chess_board.board_offset_x, chess_board.board_offset_y)
+                            if handle_move(selected_piece, tile_position):
+                                selected_piece = None
+                            elif piece and piece.color == game_rules.current_turn:
+                                selected_piece = piece
+                            else:
+                                selected_piece = None
+
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if selected_piece and dragging and not game_menu.menu_open:
+                        final_position = chess_board.handle_click(mouse_pos)
+                        handle_move(selected_piece, final_position)
+                        selected_piece = None
+                        dragging = False
+                        initial_position = None
+
+            # Clear screen for redraw
+            screen.fill((255, 255, 255))
+            chess_board.construct_board()
+
+            # Highlight selected piece and possible moves
+            if selected_piece:
+                x = chess_board.board_offset_x + selected_piece.position[1] * chess_board.tile_size
+                y = chess_board.board_offset_y + selected_piece.position[0] * chess_board.tile_size
+                pygame.draw.rect(screen, (255, 255, 0), (x, y, chess_board.tile_size, chess_board.tile_size), 3)
+
+                # legal destinations come from the per-turn map, nothing is generated per frame
+                chess_board.draw_possible_moves(selected_piece, game_status.legal_moves)
+
+            # Draw all pieces except the one currently being dragged
+            for piece in chess_board.pieces:
+                if piece != selected_piece or not dragging:
+                    chess_board.draw_piece(piece)
         
-        # Draw the piece being dragged
-        def draw_dragged_piece(piece, mouse_pos):
-            offset_x = chess_board.tile_size // 2
-            offset_y = chess_board.tile_size // 2
-            x = mouse_pos[0] - offset_x
-            y = mouse_pos[1] - offset_y
-            screen.blit(piece.image, (x, y))
-
-        if dragging and selected_piece:
-            draw_dragged_piece(selected_piece, mouse_pos)
-
-        # Draw UI elements
-        draw_turn_indicator()
-        update_game_status()
-        status_display.draw_move_history(screen, game_rules.move_history)
-        status_display.draw(screen)
-        game_menu.draw_menu(screen)
-
-        pygame.display.flip()
-        clock.tick(60)
+            # Draw the piece being dragged
+            def draw_dragged_piece(piece, mouse_pos):
+                offset_x = chess_board.tile_size // 2
+                offset_y = chess_board.tile_size // 2
+                x = mouse_pos[0] - offset_x
+                y = mouse_pos[1] - offset_y
+                screen.blit(chess_board.get_piece_image(piece.type, piece.color), (x, y))
+
+            if dragging and selected_piece:
+                draw_dragged_piece(selected_piece, mouse_pos)
+
+            # Draw UI elements
+            draw_turn_indicator()
+            update_game_status()
+            status_display.draw_move_history(screen, game_rules.move_history)
+            status_display.draw(screen)
+            game_menu.draw_menu(screen)
+
+            pygame.display.flip()
+            clock.tick(60)
+    finally:
+        # stop worker pools and release shared tables and the search cache however the game ends
+        for ai in (ai_white, ai_black):
+            if ai:
+                ai.close()
+        if search_cache is not None:
+            search_cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,40 +1,25 @@
-import pygame
+from bitboard import (SQUARE_POSITIONS, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, PAWN_PUSHES,
+                      ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS, to_positions)
 
 #base class for chess pieces
 class Piece:
     
-    def __init__(self, screen, image, color, position):
-        self.screen = screen
-        self.image = image
+    def __init__(self, color, position):
         self.color = color
         self.position = position
         self.type = self.__class__.__name__.lower()
+        self.moved_once = False
 
-    def draw(self, tile_size, board_offset_x, board_offset_y):
-        x = board_offset_x + self.position[1] * tile_size
-        y = board_offset_y + self.position[0] * tile_size
-        self.screen.blit(self.image, (x, y))
+    def copy(self):
+        piece = self.__class__(self.color, self.position)
+        piece.moved_once = self.moved_once
+        return piece
     
     def move(self, new_position, board):
         if self.is_valid_move(new_position, board):
-            target_piece = board.get_piece_at(new_position)
-            if target_piece:
-                board.pieces.remove(target_piece)
-
-            self.position = new_position
-            self.moved_once = True
-
-            if isinstance(self, Pawn):  ## Check if the piece is a pawn
-                self.check_promotion(new_position, board)   
-
+            board.make_move((self, new_position))
             return True
         return False
-
-    ## Only for the pawn -> queen change
-    def check_promotion(self, new_position, board):
-        if (self.color == 'white' and new_position[0] == 7) or \
-        (self.color == 'black' and new_position[0] == 0):
-            self.promote(board)
     
     def is_valid_move(self, new_position, board):
         if new_position not in self.get_possible_moves(board):
@@ -42,99 +27,63 @@ class Piece:
         return True
     
     def get_possible_moves(self, board):
-        possible_moves = []
-        current_row, current_col = self.position
-
-        movement_patterns = {
-            'rook': [(-1, 0), (1, 0), (0, -1), (0, 1)],
-            'knight': [(-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)],
-            'bishop': [(-1, -1), (-1, 1), (1, -1), (1, 1)],
-            'queen': [(-1, -1), (-1, 1), (1, -1), (1, 1), (0, 1), (1, 0), (-1, 0), (0, -1)],
-            'king': [(-1, -1), (-1, 1), (1, -1), (1, 1), (0, 1), (1, 0), (-1, 0), (0, -1)],
-            'pawn': [(1, 0)]
-        }
+        return to_positions(self.get_attacks(board) & ~board.occupancy[self.color])
 
-        for direction in movement_patterns[self.type]:
-            possible_moves.extend(self.get_moves_in_direction(board, current_row, current_col, direction))
+class SlidingPiece(Piece):
+    # per-square ray lists from bitboard, set by each slider
+    rays = None
 
-        return possible_moves
-    
-    def get_moves_in_direction(self, board, row, col, direction):
+    def get_possible_moves(self, board):
+        squares = board.squares
+        row, col = self.position
         moves = []
-        row_increase, col_increase = direction
-        new_row, new_col = row + row_increase, col + col_increase
-
-        if self.type in ['rook', 'bishop', 'queen']:
-            while 0 <= new_row < 8 and 0 <= new_col < 8:
-                if board.is_empty_square(new_row, new_col) or board.is_opponent_piece(new_row, new_col, self.color):
-                    moves.append((new_row, new_col))
-                    if board.is_opponent_piece(new_row, new_col, self.color):
-                        break  # Stop checking after capturing
+        for ray in self.rays[row * 8 + col]:
+            for target in ray:
+                piece = squares[target]
+                if piece is None:
+                    moves.append(SQUARE_POSITIONS[target])
                 else:
-                    break  # blocked by friendly piece
-
-                new_row += row_increase
-                new_col += col_increase
-        else:
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                if board.is_empty_square(new_row, new_col) or board.is_opponent_piece(new_row, new_col, self.color):
-                    moves.append((new_row, new_col))
-
+                    if piece.color != self.color:
+                        moves.append(SQUARE_POSITIONS[target])
+                    break
         return moves
 
-class Rook(Piece):
-    pass
+class Rook(SlidingPiece):
+    rays = ROOK_RAYS
 
 class Knight(Piece):
-    pass
+    def get_attacks(self, board):
+        row, col = self.position
+        return KNIGHT_ATTACKS[row * 8 + col]
 
-class Bishop(Piece):
-    pass    
+class Bishop(SlidingPiece):
+    rays = BISHOP_RAYS
 
-class Queen(Piece):
-    pass
+class Queen(SlidingPiece):
+    rays = QUEEN_RAYS
 
 class King(Piece):
-    pass
+    def get_attacks(self, board):
+        row, col = self.position
+        return KING_ATTACKS[row * 8 + col]
         
 class Pawn(Piece):
-    def __init__(self, screen, image, color, position):
-        super().__init__(screen, image, color, position)
-        self.moved_once = False
+    def __init__(self, color, position):
+        super().__init__(color, position)
         self.direction = 1 if color == 'white' else -1
             
     def get_possible_moves(self, board):
+        squares = board.squares
+        row, col = self.position
+        square = row * 8 + col
+        opponent = 'black' if self.color == 'white' else 'white'
+
         possible_moves = []
-        current_row, current_col = self.position
-        new_row = current_row + self.direction
-        if 0 <= new_row < 8:
-            
-            if not board.get_piece_at((new_row, current_col)):
-                possible_moves.append((new_row, current_col))
-                
-                if not self.moved_once:
-                    second_row_ahead =  current_row + (2 * self.direction)               
-                    if (0 <= second_row_ahead < 8 and not board.get_piece_at((second_row_ahead, current_col))):
-                        possible_moves.append((second_row_ahead, current_col)) 
-                                 
-        capture_squares = [
-            (new_row, current_col - 1),
-            (new_row, current_col + 1)
-        ]        
-        
-        for capture_square in capture_squares:
-            c_row, c_col = capture_square
-            if 0 <= c_row < 8 and 0 <= c_col < 8:
-                target_piece = board.get_piece_at((capture_square))
-                if target_piece and target_piece.color != self.color:
-                    possible_moves.append(capture_square)
-                    
+        for target in PAWN_PUSHES[self.color][square]:
+            if squares[target] is not None:
+                break
+            possible_moves.append(SQUARE_POSITIONS[target])
+            if self.moved_once:
+                break
+        possible_moves.extend(to_positions(PAWN_ATTACKS[self.color][square] & board.occupancy[opponent]))
         return possible_moves
-    
-    def promote(self, board):
-        board.pieces.remove(self)
-        
-        queen_image = board.get_piece_image('queen', self.color)
-        new_queen = Queen(self.screen, queen_image, self.color, self.position)
-        board.pieces.append(new_queen)
-     
\ No newline at end of file
@@ -0,0 +1,339 @@
+from piece2 import Rook, Knight, Bishop, Queen, King, Pawn
+from bitboard import (PIECE_TYPES, COLORS, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS,
+                      BISHOP_RAYS, iter_squares)
+from zobrist import PIECE_KEYS, WHITE_TO_MOVE_KEY, piece_key, compute_hash, compute_pawn_hash
+
+# plies without a capture or pawn move after which the game is drawn (the 50-move rule)
+FIFTY_MOVE_PLIES = 100
+
+PIECE_LETTERS = {
+    'p': 'pawn', 'n': 'knight', 'b': 'bishop', 'r': 'rook', 'q': 'queen', 'k': 'king'
+}
+
+
+def placements_from_rows(rows):
+    # (piece type, color, position) for a diagram listed from row 7 down to row 0, upper case is white, '.' is empty
+    placements = []
+    for row, line in enumerate(reversed(rows)):
+        for col, letter in enumerate(line):
+            if letter != '.':
+                color = 'white' if letter.isupper() else 'black'
+                placements.append((PIECE_LETTERS[letter.lower()], color, (row, col)))
+    return placements
+
+# Board state, move making and attack queries. Holds plain data only (no pygame),
+# so it can be imported and pickled by engine-only processes.
+class Position:
+    # debug switch: compare the incremental hash with a full recompute after every make/unmake
+    verify_hash = False
+    # debug switch: compare the incremental score with a full recompute after every make/unmake
+    verify_score = False
+
+    def __init__(self, pieces=None, turn='black'):
+        #invert colours
+        self.turn = turn
+        # square -> piece lookup, index is row * 8 + col
+        self.squares = [None] * 64
+        # one bitboard per (color, piece type) plus per-color occupancy, kept in sync with squares
+        self.bitboards = {color: dict.fromkeys(PIECE_TYPES, 0) for color in COLORS}
+        self.occupancy = dict.fromkeys(COLORS, 0)
+        # undo records for make_move: (piece, from_position, captured, moved_once, promoted, hash, halfmove clock)
+        self.move_stack = []
+        # hash of every earlier position of the game and the search. make/unmake push and pop it together
+        # with move_stack, but a copy() keeps the history without the moves, so len(history) >= len(move_stack)
+        self.history = []
+        # plies since the last capture or pawn move; no earlier position can repeat beyond it
+        self.halfmove_clock = 0
+        # Zobrist hash of placement, double-step rights and side to move, updated incrementally
+        self.hash = 0
+        # Zobrist hash of the pawns alone, for the pawn structure cache
+        self.pawn_hash = 0
+        # material + piece-square value per (color, type, square) installed by the AI, negative for black
+        self.square_values = None
+        # sum of square_values over the pieces on the board, updated incrementally
+        self.score = 0
+        # counts wholesale piece replacements (new game, loaded game), which the hash alone cannot tell apart
+        self.setups = 0
+        self.pieces = self.initialize_pieces() if pieces is None else pieces
+
+    @property
+    def pieces(self):
+        return [piece for piece in self.squares if piece is not None]
+
+    @pieces.setter
+    def pieces(self, pieces):
+        self.squares = [None] * 64
+        self.bitboards = {color: dict.fromkeys(PIECE_TYPES, 0) for color in COLORS}
+        self.occupancy = dict.fromkeys(COLORS, 0)
+        self.move_stack = []
+        self.history = []
+        self.halfmove_clock = 0
+        self.setups += 1
+        self.hash = WHITE_TO_MOVE_KEY if self.turn == 'white' else 0
+        self.pawn_hash = 0
+        self.score = 0
+        for piece in pieces:
+            self.place_piece(piece)
+
+    def set_turn(self, color):
+        if color != self.turn:
+            self.turn = color
+            self.hash ^= WHITE_TO_MOVE_KEY
+
+    def set_square_values(self, square_values):
+        self.square_values = square_values
+        self.score = self.compute_score()
+
+    @property
+    def occupied(self):
+        return self.occupancy['white'] | self.occupancy['black']
+
+    def initialize_pieces(self):
+        pieces = []
+        white_positions = {
+            Rook: [(0, 0), (0, 7)],
+            Knight: [(0, 1), (0, 6)],
+            Bishop: [(0, 2), (0, 5)],
+            Queen: [(0, 3)],
+            King: [(0, 4)],
+            Pawn: [(1, col) for col in range(8)]
+        }
+        black_positions = {
+            Rook: [(7, 0), (7, 7)],
+            Knight: [(7, 1), (7, 6)],
+            Bishop: [(7, 2), (7, 5)],
+            Queen: [(7, 3)],
+            King: [(7, 4)],
+            Pawn: [(6, col) for col in range(8)]
+        }
+        for piece_class, positions in white_positions.items():
+            for position in positions:
+                pieces.append(piece_class('white', position))
+        # black piece init
+        for piece_class, positions in black_positions.items():
+            for position in positions:
+                pieces.append(piece_class('black', position))
+        return pieces
+
+    def get_piece_at(self, position):
+        row, col = position
+        if 0 <= row < 8 and 0 <= col < 8:
+            return self.squares[row * 8 + col]
+        return None
+
+    def set_square(self, square, piece):
+        bit = 1 << square
+        square_values = self.square_values
+        old_piece = self.squares[square]
+        if old_piece is not None:
+            self.bitboards[old_piece.color][old_piece.type] ^= bit
+            self.occupancy[old_piece.color] ^= bit
+            self.hash ^= piece_key(old_piece, square)
+            if old_piece.type == 'pawn':
+                self.pawn_hash ^= PIECE_KEYS[old_piece.color]['pawn'][square]
+            if square_values is not None:
+                self.score -= square_values[old_piece.color][old_piece.type][square]
+        self.squares[square] = piece
+        if piece is not None:
+            self.bitboards[piece.color][piece.type] |= bit
+            self.occupancy[piece.color] |= bit
+            self.hash ^= piece_key(piece, square)
+            if piece.type == 'pawn':
+                self.pawn_hash ^= PIECE_KEYS[piece.color]['pawn'][square]
+            if square_values is not None:
+                self.score += square_values[piece.color][piece.type][square]
+
+    def place_piece(self, piece):
+        row, col = piece.position
+        self.set_square(row * 8 + col, piece)
+
+    def make_move(self, move):
+        piece, destination = move
+        from_position = piece.position
+        from_row, from_col = from_position
+        row, col = destination
+        square = row * 8 + col
+
+        captured_piece = self.squares[square]
+        moved_once = piece.moved_once
+        previous_hash = self.hash
+        self.set_square(from_row * 8 + from_col, None)
+        piece.moved_once = True
+        self.set_square(square, piece)
+        piece.position = destination
+
+        promoted_piece = None
+        if piece.type == 'pawn' and row == (7 if piece.color == 'white' else 0):
+            promoted_piece = self.create_piece('queen', piece.color, destination)
+            self.set_square(square, promoted_piece)
+
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.hash ^= WHITE_TO_MOVE_KEY
+        self.move_stack.append((piece, from_position, captured_piece, moved_once, promoted_piece, previous_hash,
+                                self.halfmove_clock))
+        self.history.append(previous_hash)
+        if captured_piece is not None or piece.type == 'pawn':
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.verify_hash:
+            self.check_hash()
+        if self.verify_score:
+            self.check_score()
+        return captured_piece
+
+    def make_null_move(self):
+        # passes the turn without moving, for null-move pruning; undone by unmake_move
+        self.move_stack.append((None, None, None, None, None, self.hash, self.halfmove_clock))
+        self.history.append(self.hash)
+        # positions before a null move do not count as repetitions
+        self.halfmove_clock = 0
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.hash ^= WHITE_TO_MOVE_KEY
+
+    def unmake_move(self):
+        (piece, from_position, captured_piece, moved_once, promoted_piece, previous_hash,
+         self.halfmove_clock) = self.move_stack.pop()
+        self.history.pop()
+        if piece is None:
+            self.turn = 'black' if self.turn == 'white' else 'white'
+            self.hash = previous_hash
+            return
+        row, col = piece.position
+        from_row, from_col = from_position
+        self.set_square(row * 8 + col, captured_piece)
+        piece.moved_once = moved_once
+        self.set_square(from_row * 8 + from_col, piece)
+        piece.position = from_position
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.hash = previous_hash
+        if self.verify_hash:
+            self.check_hash()
+        if self.verify_score:
+            self.check_score()
+
+    def repetition_count(self, limit=2):
+        # earlier occurrences of this position, up to limit; only the reversible stretch is scanned
+        # and only every other entry, where the same side was to move
+        history = self.history
+        count = 0
+        for index in range(len(history) - 2, len(history) - self.halfmove_clock - 1, -2):
+            if index < 0:
+                break
+            if history[index] == self.hash:
+                count += 1
+                if count >= limit:
+                    break
+        return count
+
+    def check_hash(self):
+        expected = compute_hash(self)
+        if self.hash != expected:
+            raise RuntimeError(f"Incremental hash {self.hash:016x} does not match recomputed {expected:016x}")
+        expected = compute_pawn_hash(self)
+        if self.pawn_hash != expected:
+            raise RuntimeError(f"Incremental pawn hash {self.pawn_hash:016x} does not match recomputed {expected:016x}")
+
+    def compute_score(self):
+        # full recompute, the reference for the incremental score
+        if self.square_values is None:
+            return 0
+        return sum(self.square_values[piece.color][piece.type][square]
+                   for square, piece in enumerate(self.squares) if piece is not None)
+
+    def check_score(self):
+        expected = self.compute_score()
+        if self.score != expected:
+            raise RuntimeError(f"Incremental score {self.score} does not match recomputed {expected}")
+
+    def is_square_attacked(self, square, color):
+        # looks outward from square: leaper offsets first, then the first piece on each ray
+        pieces = self.bitboards[color]
+        opponent = 'black' if color == 'white' else 'white'
+        if KNIGHT_ATTACKS[square] & pieces['knight']:
+            return True
+        if PAWN_ATTACKS[opponent][square] & pieces['pawn']:
+            return True
+        if KING_ATTACKS[square] & pieces['king']:
+            return True
+
+        squares = self.squares
+        queens = pieces['queen']
+        for rays, sliders in ((ROOK_RAYS, pieces['rook'] | queens), (BISHOP_RAYS, pieces['bishop'] | queens)):
+            if not sliders:
+                continue
+            for ray in rays[square]:
+                for target in ray:
+                    if squares[target] is not None:
+                        if sliders >> target & 1:
+                            return True
+                        break
+        return False
+
+    def attackers_to(self, square, color):
+        # bitboard of every piece of color attacking square
+        pieces = self.bitboards[color]
+        opponent = 'black' if color == 'white' else 'white'
+        attackers = KNIGHT_ATTACKS[square] & pieces['knight']
+        attackers |= PAWN_ATTACKS[opponent][square] & pieces['pawn']
+        attackers |= KING_ATTACKS[square] & pieces['king']
+
+        squares = self.squares
+        queens = pieces['queen']
+        for rays, sliders in ((ROOK_RAYS, pieces['rook'] | queens), (BISHOP_RAYS, pieces['bishop'] | queens)):
+            if not sliders:
+                continue
+            for ray in rays[square]:
+                for target in ray:
+                    if squares[target] is not None:
+                        attackers |= sliders & (1 << target)
+                        break
+        return attackers
+
+    def move_piece(self, piece, new_position):
+        if piece and piece.move(new_position, self):
+            return True
+        return False
+    
+    def is_empty_square(self, row, col):
+        return self.squares[row * 8 + col] is None
+
+    def is_opponent_piece(self, row, col, current_color):
+        piece = self.squares[row * 8 + col]
+        return piece is not None and piece.color != current_color
+
+    def get_pieces_by_color(self, color):
+        return [self.squares[square] for square in iter_squares(self.occupancy[color])]
+    
+    def find_king(self, color):
+        for square in iter_squares(self.bitboards[color]['king']):
+            return self.squares[square]
+        return None
+
+    def load_pieces(self, placements):
+        # replaces the pieces from (piece type, color, position) triples, as kept by saved games; these carry
+        # no move flags, so a pawn off its start row is taken to have moved and lost its double step
+        pieces = []
+        for piece_type, color, position in placements:
+            piece = self.create_piece(piece_type, color, position)
+            piece.moved_once = piece_type == 'pawn' and position[0] != (1 if color == 'white' else 6)
+            pieces.append(piece)
+        self.pieces = pieces
+
+    def create_piece(self, piece_type, color, position):
+        piece_classes = {
+            'rook': Rook,
+            'knight': Knight,
+            'bishop': Bishop,
+            'queen': Queen,
+            'king': King,
+            'pawn': Pawn
+        }
+        return piece_classes[piece_type](color, position)
+
+    def copy(self):
+        # detached headless copy, e.g. to hand to a worker process; keeps the history for repetitions
+        position = Position([piece.copy() for piece in self.pieces], self.turn)
+        position.history = list(self.history)
+        position.halfmove_clock = self.halfmove_clock
+        return position
@@ -0,0 +1,106 @@
+import mmap
+import os
+import struct
+
+MAGIC = b'MCSCACHE'
+# magic, bucket count, use clock
+HEADER = struct.Struct('<8sQQ8x')
+# position hash, last use, score, encoded move, depth (0 marks an empty record)
+RECORD = struct.Struct('<QQihbx')
+BUCKET_SIZE = 4
+
+
+class SearchCache:
+    """
+    Root search results kept in a memory-mapped file across games and restarts.
+
+    Records are grouped in buckets of BUCKET_SIZE by position hash. A full
+    bucket evicts its least recently used record, so the file never grows past
+    size_mb. Nothing is read until the first probe or store.
+    """
+
+    def __init__(self, path, size_mb=4):
+        self.path = path
+        self.size_mb = size_mb
+        self.file = None
+        self.map = None
+        self.bucket_count = 0
+        self.clock = 0
+        self.probes = 0
+        self.hits = 0
+
+    def open(self):
+        bucket_count = max(1, int(self.size_mb * 1024 * 1024) // (RECORD.size * BUCKET_SIZE))
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size:
+            self.file = open(self.path, 'r+b')
+            magic, stored_count, clock = HEADER.unpack(self.file.read(HEADER.size))
+            if magic == MAGIC and os.path.getsize(self.path) == HEADER.size + stored_count * BUCKET_SIZE * RECORD.size:
+                # an existing cache keeps the size it was created with
+                self.map = mmap.mmap(self.file.fileno(), 0)
+                self.bucket_count = stored_count
+                self.clock = clock
+                return
+        else:
+            self.file = open(self.path, 'w+b')
+
+        # missing or unreadable: start an empty cache
+        self.file.truncate(0)
+        self.file.truncate(HEADER.size + bucket_count * BUCKET_SIZE * RECORD.size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        HEADER.pack_into(self.map, 0, MAGIC, bucket_count, 0)
+        self.bucket_count = bucket_count
+        self.clock = 0
+
+    def tick(self):
+        self.clock += 1
+        struct.pack_into('<Q', self.map, 16, self.clock)
+        return self.clock
+
+    def bucket_offsets(self, key):
+        start = HEADER.size + (key % self.bucket_count) * BUCKET_SIZE * RECORD.size
+        return range(start, start + BUCKET_SIZE * RECORD.size, RECORD.size)
+
+    def probe(self, key):
+        # (depth, score, encoded move) for key, or None
+        if self.map is None:
+            self.open()
+        self.probes += 1
+        for offset in self.bucket_offsets(key):
+            stored_key, _, score, move, depth = RECORD.unpack_from(self.map, offset)
+            if depth and stored_key == key:
+                RECORD.pack_into(self.map, offset, key, self.tick(), score, move, depth)
+                self.hits += 1
+                return depth, score, move
+        return None
+
+    def store(self, key, depth, score, move):
+        if self.map is None:
+            self.open()
+        target = None
+        oldest = None
+        for offset in self.bucket_offsets(key):
+            stored_key, last_used, _, _, stored_depth = RECORD.unpack_from(self.map, offset)
+            if stored_depth and stored_key == key:
+                if stored_depth > depth:
+                    return
+                target = offset
+                break
+            if target is None and not stored_depth:
+                target = offset
+            if stored_depth and (oldest is None or last_used < oldest[0]):
+                oldest = (last_used, offset)
+        if target is None:
+            target = oldest[1]
+        RECORD.pack_into(self.map, target, key, self.tick(), score, move, min(depth, 127))
+        self.map.flush()
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+            self.map = None
+            self.file = None
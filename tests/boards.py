@@ -0,0 +1,8 @@
+from position import Position, placements_from_rows
+
+
+def make_position(rows, turn='white'):
+    # rows are listed from row 7 down to row 0, upper case is white, '.' is empty
+    position = Position(turn=turn)
+    position.load_pieces(placements_from_rows(rows))
+    return position
@@ -0,0 +1,219 @@
+from game_rules import GameRules
+from position import Position
+from tests.boards import make_position
+
+
+def destinations(game_rules, color, position):
+    return sorted(destination for piece, destination in game_rules.legal_moves(color)
+                  if piece.position == position)
+
+
+def filtered_moves(board, game_rules, color):
+    # reference: every pseudo-legal move that does not leave the own king attacked
+    moves = []
+    for piece in board.get_pieces_by_color(color):
+        for destination in piece.get_possible_moves(board):
+            from_position = piece.position
+            board.make_move((piece, destination))
+            if not game_rules.is_in_check(color):
+                moves.append((from_position, destination))
+            board.unmake_move()
+    return sorted(moves)
+
+
+def test_pinned_rook_moves_along_the_pin_only():
+    board = make_position([
+        'k...r...',
+        '........',
+        '........',
+        '........',
+        '........',
+        '........',
+        '....R...',
+        '....K...',
+    ])
+    game_rules = GameRules(board)
+    assert destinations(game_rules, 'white', (1, 4)) == [(row, 4) for row in range(2, 8)]
+
+
+def test_pinned_knight_and_diagonally_pinned_rook_cannot_move():
+    board = make_position([
+        'k...r...',
+        '........',
+        '........',
+        '........',
+        '........',
+        '....N...',
+        '........',
+        '....K...',
+    ])
+    game_rules = GameRules(board)
+    assert destinations(game_rules, 'white', (2, 4)) == []
+    board = make_position([
+        'k.......',
+        '........',
+        '........',
+        '........',
+        '.......b',
+        '........',
+        '.....R..',
+        '....K...',
+    ])
+    game_rules = GameRules(board)
+    assert destinations(game_rules, 'white', (1, 5)) == []
+
+
+def test_pinned_pawn_may_only_capture_the_pinner():
+    board = make_position([
+        '.......k',
+        '........',
+        '........',
+        '........',
+        '........',
+        '..b.....',
+        '.P......',
+        'K.......',
+    ])
+    game_rules = GameRules(board)
+    assert destinations(game_rules, 'white', (1, 1)) == [(2, 2)]
+
+
+def test_double_check_allows_king_moves_only():
+    board = make_position([
+        'k...r...',
+        '........',
+        '........',
+        '........',
+        '........',
+        '...n....',
+        '.......Q',
+        '....K...',
+    ])
+    game_rules = GameRules(board)
+    assert len(game_rules.get_checkers('white')) == 2
+    moves = game_rules.legal_moves('white')
+    assert moves and all(piece.type == 'king' for piece, _ in moves)
+    assert sorted((piece.position, destination) for piece, destination in moves) == \
+        filtered_moves(board, game_rules, 'white')
+
+
+def test_single_check_can_be_blocked_or_captured():
+    board = make_position([
+        'k...r...',
+        '........',
+        '........',
+        '........',
+        '........',
+        '........',
+        'R.......',
+        '...QK...',
+    ])
+    game_rules = GameRules(board)
+    moves = sorted((piece.position, destination) for piece, destination in game_rules.legal_moves('white'))
+    assert ((1, 0), (1, 4)) in moves
+    assert ((0, 3), (1, 4)) in moves
+    assert moves == filtered_moves(board, game_rules, 'white')
+
+
+def test_generator_matches_make_unmake_filter_through_a_game():
+    board = Position()
+    game_rules = GameRules(board)
+    for ply in range(60):
+        color = board.turn
+        expected = filtered_moves(board, game_rules, color)
+        moves = game_rules.legal_moves(color)
+        assert sorted((piece.position, destination) for piece, destination in moves) == expected
+        assert game_rules.has_legal_move(color) == bool(expected)
+        if not moves:
+            break
+        # a fixed but varied line through the game
+        board.make_move(moves[(ply * 7) % len(moves)])
+
+
+def test_status_is_cached_until_the_position_or_its_pieces_change():
+    board = Position()
+    game_rules = GameRules(board)
+    status = game_rules.get_status()
+    assert game_rules.get_status() is status
+
+    # same placement rebuilt from new piece objects, as when a game is loaded
+    board.pieces = [piece.copy() for piece in board.pieces]
+    reloaded = game_rules.get_status()
+    assert reloaded is not status
+    pieces = board.pieces
+    assert all(any(piece is other for other in pieces) for piece in reloaded.legal_moves)
+
+    piece, destination = game_rules.legal_moves(board.turn)[0]
+    board.make_move((piece, destination))
+    assert game_rules.get_status().turn == board.turn
+
+
+# knights out and back for both sides, black moves first
+KNIGHT_SHUFFLE = [((7, 1), (5, 2)), ((0, 1), (2, 2)), ((5, 2), (7, 1)), ((2, 2), (0, 1))]
+
+
+def play(board, moves):
+    for (from_row, from_col), destination in moves:
+        board.make_move((board.squares[from_row * 8 + from_col], destination))
+
+
+def test_threefold_repetition_ends_the_game():
+    board = Position()
+    game_rules = GameRules(board)
+    play(board, KNIGHT_SHUFFLE)
+    assert board.repetition_count() == 1
+    assert game_rules.is_game_over() is None
+    play(board, KNIGHT_SHUFFLE)
+    assert board.repetition_count() == 2
+    assert game_rules.is_game_over() == "Draw by threefold repetition!"
+
+    for _ in range(len(KNIGHT_SHUFFLE)):
+        board.unmake_move()
+    assert board.repetition_count() == 1
+    assert board.halfmove_clock == len(KNIGHT_SHUFFLE)
+    assert game_rules.is_game_over() is None
+
+
+def test_repetitions_are_not_counted_across_a_pawn_move():
+    board = Position()
+    play(board, KNIGHT_SHUFFLE)
+    play(board, [((6, 0), (5, 0)), ((1, 0), (2, 0))])
+    assert board.halfmove_clock == 0
+    play(board, KNIGHT_SHUFFLE)
+    # the start position recurs in the hashes, but only after the pawn moves is scanned
+    assert board.repetition_count() == 1
+
+
+def test_fifty_move_rule_ends_the_game():
+    board = Position()
+    game_rules = GameRules(board)
+    for _ in range(25):
+        play(board, KNIGHT_SHUFFLE)
+    assert board.halfmove_clock == 100
+    assert game_rules.is_game_over() == "Draw by the 50-move rule!"
+
+
+def test_checkmate_takes_precedence_over_the_fifty_move_rule():
+    board = make_position([
+        'k.......',
+        '........',
+        '.K......',
+        '........',
+        '........',
+        '........',
+        '........',
+        '.Q......',
+    ], turn='white')
+    game_rules = GameRules(board)
+    board.halfmove_clock = 99
+    board.make_move((board.squares[1], (6, 1)))
+    assert board.halfmove_clock == 100
+    assert game_rules.is_game_over() == "Checkmate!"
+
+
+def test_loaded_pawns_off_their_start_row_have_lost_the_double_step():
+    board = Position()
+    board.load_pieces([('king', 'white', (0, 4)), ('king', 'black', (7, 4)),
+                       ('pawn', 'white', (1, 0)), ('pawn', 'white', (2, 1)), ('pawn', 'black', (5, 2))])
+    moves = {piece.position: sorted(piece.get_possible_moves(board)) for piece in board.pieces if piece.type == 'pawn'}
+    assert moves == {(1, 0): [(2, 0), (3, 0)], (2, 1): [(3, 1)], (5, 2): [(4, 2)]}
@@ -0,0 +1,74 @@
+from chess_ai import ChessAI
+from game_rules import GameRules
+from position import Position
+from search_cache import SearchCache
+from transposition import encode_move
+from tests.boards import make_position
+
+MIDDLEGAME = [
+    'r..q.rk.',
+    'pp..bppp',
+    '..n.pn..',
+    '...p....',
+    '..PP....',
+    '..N..N..',
+    'PP..BPPP',
+    'R..QKB.R',
+]
+
+
+def test_node_limit_is_respected():
+    for options in ({}, {'incremental_eval': False, 'quiescence': False, 'batch_eval': True}):
+        board = make_position(MIDDLEGAME)
+        ai = ChessAI(board, GameRules(board), depth=20, node_limit=5000, **options)
+        ai.get_best_move(board.turn)
+        assert ai.search_stats['nodes'] <= 5000 + 64
+        assert board.move_stack == []
+
+
+def test_node_limit_still_completes_the_first_iteration():
+    board = Position()
+    ai = ChessAI(board, GameRules(board), depth=20, node_limit=1)
+    piece, destination = ai.get_best_move(board.turn)
+    assert destination in piece.get_possible_moves(board)
+    assert ai.search_stats['depth'] == 1
+
+
+def test_frontier_batch_scores_repetitions_like_negamax():
+    # black, a queen down, can move its knight back and repeat the starting position
+    values = []
+    for batch_eval in (False, True):
+        board = make_position([
+            '.n..k...',
+            '........',
+            '........',
+            '........',
+            '........',
+            '........',
+            '........',
+            '.N.QK...',
+        ])
+        for (from_row, from_col), destination in [((0, 1), (2, 2)), ((7, 1), (5, 2)), ((2, 2), (0, 1))]:
+            board.make_move((board.squares[from_row * 8 + from_col], destination))
+        ai = ChessAI(board, GameRules(board), incremental_eval=False, quiescence=False, batch_eval=batch_eval,
+                     null_move_pruning=False, futility_pruning=False, razoring=False)
+        assert (ai.batch_evaluator is not None) == batch_eval
+        ai.reset_search_state()
+        values.append(ai.negamax(1, float('-inf'), float('inf'), 1))
+    assert values == [0, 0]
+
+
+def test_search_cache_answer_is_not_trusted_where_repetitions_are_possible(tmp_path):
+    search_cache = SearchCache(str(tmp_path / "cache.bin"), size_mb=0)
+    shuffle = [((7, 1), (5, 2)), ((0, 1), (2, 2)), ((5, 2), (7, 1)), ((2, 2), (0, 1))]
+    for moves, searched in ((0, False), (4, True)):
+        board = Position()
+        for (from_row, from_col), destination in shuffle[:moves]:
+            board.make_move((board.squares[from_row * 8 + from_col], destination))
+        # a deep result for this position, as if from an earlier game
+        piece = board.squares[6 * 8]
+        search_cache.store(board.hash, 10, 0, encode_move((piece, (5, 0))))
+        ai = ChessAI(board, GameRules(board), depth=3, search_cache=search_cache)
+        ai.get_best_move(board.turn)
+        assert (ai.search_stats['nodes'] > 0) == searched
+    search_cache.close()
@@ -0,0 +1,52 @@
+from search_cache import SearchCache, BUCKET_SIZE
+
+
+def test_full_bucket_evicts_least_recently_used(tmp_path):
+    # a size this small holds a single bucket, so every key shares it
+    cache = SearchCache(str(tmp_path / "cache.bin"), size_mb=0)
+    for key in range(1, BUCKET_SIZE + 1):
+        cache.store(key, 4, key * 10, key)
+    # key 1 is used again, key 2 is now the oldest
+    assert cache.probe(1) == (4, 10, 1)
+    cache.store(99, 4, 990, 99)
+    assert cache.probe(2) is None
+    for key in (1, 3, 4, 99):
+        assert cache.probe(key) is not None
+    cache.close()
+
+
+def test_shallower_result_does_not_replace_deeper(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.bin"), size_mb=0)
+    cache.store(7, 5, 120, 3)
+    cache.store(7, 3, -40, 4)
+    assert cache.probe(7) == (5, 120, 3)
+    cache.store(7, 6, 80, 5)
+    assert cache.probe(7) == (6, 80, 5)
+    cache.close()
+
+
+def test_results_and_use_order_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    cache = SearchCache(path, size_mb=0)
+    for key in range(1, BUCKET_SIZE + 1):
+        cache.store(key, 4, key, key)
+    cache.probe(1)
+    cache.close()
+
+    cache = SearchCache(path, size_mb=0)
+    assert cache.probe(3) == (4, 3, 3)
+    cache.store(99, 4, 99, 99)
+    # the clock carried over, so key 2 is still the least recently used
+    assert cache.probe(2) is None
+    assert cache.probe(1) == (4, 1, 1)
+    cache.close()
+
+
+def test_unreadable_file_starts_an_empty_cache(tmp_path):
+    path = tmp_path / "cache.bin"
+    path.write_bytes(b"not a cache" * 10)
+    cache = SearchCache(str(path), size_mb=0)
+    assert cache.probe(1) is None
+    cache.store(1, 4, 10, 1)
+    assert cache.probe(1) == (4, 10, 1)
+    cache.close()
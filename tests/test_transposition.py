@@ -0,0 +1,48 @@
+import os
+
+from transposition import (SharedTranspositionTable, EXACT, LOWER_BOUND, HEADER_WORDS, pack_entry)
+
+
+def test_shared_table_round_trip_between_attached_tables():
+    table = SharedTranspositionTable(1)
+    attached = SharedTranspositionTable(name=table.name)
+    try:
+        table.store(12345, 4, -70, EXACT, 100)
+        assert attached.probe(12345) == (4, -70, EXACT, 100)
+        assert attached.probe(54321) is None
+    finally:
+        attached.close()
+        table.close()
+
+
+def test_shared_table_rejects_torn_entries():
+    table = SharedTranspositionTable(1)
+    try:
+        key = 12345
+        table.store(key, 4, -70, EXACT, 100)
+        slot = HEADER_WORDS + (key % table.bucket_count) * 4
+        # a second writer got its entry word in but not yet its check word
+        table.words[slot] = pack_entry(6, 300, LOWER_BOUND, 7, table.generation)
+        assert table.probe(key) is None
+        # and the other way round, the check word of a different key
+        table.clear()
+        table.store(key, 4, -70, EXACT, 100)
+        table.words[slot + 1] ^= 1
+        assert table.probe(key) is None
+    finally:
+        table.close()
+
+
+def test_shared_table_block_is_unlinked():
+    table = SharedTranspositionTable(1)
+    path = os.path.join('/dev/shm', table.name.lstrip('/'))
+    assert os.path.exists(path)
+    table.close()
+    table.close()
+    assert not os.path.exists(path)
+
+    # never closed: the block goes away with the table
+    table = SharedTranspositionTable(1)
+    path = os.path.join('/dev/shm', table.name.lstrip('/'))
+    del table
+    assert not os.path.exists(path)
@@ -0,0 +1,253 @@
+import weakref
+from array import array
+from multiprocessing import shared_memory
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+NO_MOVE = -1
+
+# key (8) + score (4) + move (2) + depth (1) + bound (1) + generation (1)
+ENTRY_BYTES = 17
+# slots sampled when estimating how full the table is
+FILL_SAMPLE = 1000
+
+# shared table slot: packed entry word + (key ^ entry) word
+SHARED_ENTRY_BYTES = 16
+# leading words of the shared block; word 0 holds the current generation
+HEADER_WORDS = 2
+SCORE_OFFSET = 1 << 31
+
+
+def encode_move(move):
+    piece, (row, col) = move
+    from_row, from_col = piece.position
+    return (from_row * 8 + from_col) * 64 + row * 8 + col
+
+
+def decode_move(board, encoded):
+    # (piece, destination) for a stored move, or None if it no longer fits the board
+    if encoded == NO_MOVE:
+        return None
+    from_square, to_square = divmod(encoded, 64)
+    piece = board.squares[from_square]
+    if piece is None:
+        return None
+    return piece, (to_square >> 3, to_square & 7)
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results keyed by position hash.
+
+    Entries live in parallel typed arrays, so memory is bounded by size_mb.
+    Each bucket has two slots: a depth-preferred slot that keeps the deepest
+    result of the current search, and an always-replace slot for everything else.
+    """
+
+    def __init__(self, size_mb=16):
+        self.bucket_count = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * 2))
+        self.size = self.bucket_count * 2
+
+        self.keys = array('Q', [0]) * self.size
+        self.scores = array('i', [0]) * self.size
+        self.moves = array('h', [NO_MOVE]) * self.size
+        self.depths = array('b', [-1]) * self.size
+        self.bounds = array('b', [EXACT]) * self.size
+        self.generations = array('B', [0]) * self.size
+
+        self.generation = 1
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.keys = array('Q', [0]) * self.size
+        self.depths = array('b', [-1]) * self.size
+
+    def new_search(self):
+        # age every stored entry so the next search can overwrite them freely
+        self.generation = self.generation % 255 + 1
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        # (depth, score, bound, move) for key, or None
+        self.probes += 1
+        slot = (key % self.bucket_count) * 2
+        if self.keys[slot] != key or self.depths[slot] < 0:
+            slot += 1
+            if self.keys[slot] != key or self.depths[slot] < 0:
+                return None
+        self.hits += 1
+        return self.depths[slot], self.scores[slot], self.bounds[slot], self.moves[slot]
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        slot = (key % self.bucket_count) * 2
+        if (self.keys[slot] != key and self.depths[slot] >= 0 and
+                self.generations[slot] == self.generation and depth < self.depths[slot]):
+            # the deeper current-search entry keeps the depth-preferred slot
+            slot += 1
+
+        if move == NO_MOVE and self.keys[slot] == key:
+            move = self.moves[slot]
+        self.keys[slot] = key
+        self.scores[slot] = score
+        self.moves[slot] = move
+        self.depths[slot] = min(depth, 127)
+        self.bounds[slot] = bound
+        self.generations[slot] = self.generation
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill(self):
+        # fraction of sampled slots holding an entry from the current search
+        sample = min(self.size, FILL_SAMPLE)
+        used = sum(1 for slot in range(sample)
+                   if self.depths[slot] >= 0 and self.generations[slot] == self.generation)
+        return used / sample
+
+
+class ScoreCache:
+    """
+    Direct-mapped cache of evaluation scores keyed by a 64-bit hash.
+
+    Bounded to size entries; a new score replaces whatever shares its slot.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.keys = array('Q', [0]) * size
+        self.scores = array('i', [0]) * size
+        self.used = array('B', [0]) * size
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        # scores stay valid between searches, only the statistics restart
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        self.probes += 1
+        slot = key % self.size
+        if self.used[slot] and self.keys[slot] == key:
+            self.hits += 1
+            return self.scores[slot]
+        return None
+
+    def store(self, key, score):
+        slot = key % self.size
+        self.keys[slot] = key
+        self.scores[slot] = score
+        self.used[slot] = 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+
+def pack_entry(depth, score, bound, move, generation):
+    # score 32 bits, move + 1 13 bits, depth + 1 8 bits, bound 2 bits, generation 8 bits
+    return ((score + SCORE_OFFSET) | (move + 1) << 32 | (min(depth, 127) + 1) << 45 |
+            bound << 53 | generation << 55)
+
+
+def unpack_entry(entry):
+    # (depth, score, bound, move)
+    return (((entry >> 45) & 0xFF) - 1, (entry & 0xFFFFFFFF) - SCORE_OFFSET,
+            (entry >> 53) & 3, ((entry >> 32) & 0x1FFF) - 1)
+
+
+def release_shared_block(words, memory, owner):
+    # detach from a shared table's block, the creator also frees it; runs once per table
+    words.release()
+    memory.close()
+    if owner:
+        memory.unlink()
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table in a multiprocessing.shared_memory block, probed and
+    filled by every process of a root-parallel search.
+
+    Slots are two 64-bit words: the packed entry and the key XOR the entry.
+    Writes take no lock; a probe only accepts a slot whose words still agree
+    with the key, so an entry torn by two concurrent writers reads as a miss.
+    The creator sizes the block in MB, other processes attach by name. The
+    creator unlinks the block in close(), or at the latest when the table is
+    collected or the interpreter exits, so it is not left behind in /dev/shm.
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        if name is None:
+            bucket_count = max(1, int(size_mb * 1024 * 1024) // (SHARED_ENTRY_BYTES * 2))
+            self.memory = shared_memory.SharedMemory(
+                create=True, size=HEADER_WORDS * 8 + bucket_count * 2 * SHARED_ENTRY_BYTES)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.memory.name
+        self.words = self.memory.buf.cast('Q')
+        self.release = weakref.finalize(self, release_shared_block, self.words, self.memory, self.owner)
+        self.bucket_count = (len(self.words) - HEADER_WORDS) // 4
+        self.size = self.bucket_count * 2
+
+        if self.owner:
+            self.words[0] = 1
+        self.generation = self.words[0]
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.memory.buf[HEADER_WORDS * 8:] = bytes(self.memory.size - HEADER_WORDS * 8)
+
+    def new_search(self):
+        # only the creator ages the table, attached processes pick up its generation
+        if self.owner:
+            self.words[0] = self.words[0] % 255 + 1
+        self.generation = self.words[0]
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        self.probes += 1
+        words = self.words
+        slot = HEADER_WORDS + (key % self.bucket_count) * 4
+        for word in (slot, slot + 2):
+            entry = words[word]
+            if entry and words[word + 1] ^ entry == key:
+                self.hits += 1
+                return unpack_entry(entry)
+        return None
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        words = self.words
+        slot = HEADER_WORDS + (key % self.bucket_count) * 4
+        entry = words[slot]
+        if (entry and words[slot + 1] ^ entry != key and entry >> 55 == self.generation and
+                depth < ((entry >> 45) & 0xFF) - 1):
+            # the deeper current-search entry keeps the depth-preferred slot
+            slot += 2
+
+        entry = words[slot]
+        if move == NO_MOVE and entry and words[slot + 1] ^ entry == key:
+            move = ((entry >> 32) & 0x1FFF) - 1
+        entry = pack_entry(depth, score, bound, move, self.generation)
+        words[slot] = entry
+        words[slot + 1] = key ^ entry
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill(self):
+        sample = min(self.size, FILL_SAMPLE)
+        used = sum(1 for slot in range(sample)
+                   if self.words[HEADER_WORDS + slot * 2] >> 55 == self.generation)
+        return used / sample
+
+    def close(self):
+        # detach this process, the creator also frees the block
+        self.release()
@@ -14,15 +14,18 @@ class StatusDisplay:
         self.padding = 10
         
         self.x_position = board_width + self.padding
-        self.y_position = (board_height // 2) - (self.status_height // 2) - 50
+        self.y_position = (board_height // 2) - (self.status_height // 2) - 30
         
         self.ai_stats = {
             'depth': 0,
             'positions_evaluated': 0,
             'evaluation_time': 0,
-            'positions_per_second': 0
+            'positions_per_second': 0,
+            'tt_hit_rate': 0,
+            'tt_fill': 0,
+            'first_move_cutoff_rate': 0
         }
-        self.ai_stats_height = 160
+        self.ai_stats_height = 196
         # self.ai_stats_x_position = self.x_position - sidebar_width + self.padding  # Shift stats to the right
         self.ai_stats_x_position = self.x_position
         # self.ai_stats_y_position = self.y_position + self.status_height - 200
@@ -58,6 +61,11 @@ class StatusDisplay:
                 'border': (148, 163, 184),
                 'text': (51, 65, 85)
             },
+            'draw': {
+                'bg': (241, 245, 249),
+                'border': (148, 163, 184),
+                'text': (51, 65, 85)
+            },
             'stats': {
                 'bg': (243, 244, 246),
                 'border': (209, 213, 219),
@@ -73,10 +81,14 @@ class StatusDisplay:
         self.message_start_time = 0
         self.should_display = False
         
-    def update_ai_stats(self, depth, positions_evaluated, evaluation_time):
+    def update_ai_stats(self, depth, positions_evaluated, evaluation_time, tt_hit_rate=0, tt_fill=0,
+                        first_move_cutoff_rate=0):
         self.ai_stats['depth'] = depth
         self.ai_stats['positions_evaluated'] = positions_evaluated
         self.ai_stats['evaluation_time'] = evaluation_time
+        self.ai_stats['tt_hit_rate'] = tt_hit_rate
+        self.ai_stats['tt_fill'] = tt_fill
+        self.ai_stats['first_move_cutoff_rate'] = first_move_cutoff_rate
         if evaluation_time > 0:
             self.ai_stats['positions_per_second'] = int(positions_evaluated / evaluation_time)
         else:
@@ -118,13 +130,15 @@ class StatusDisplay:
         
         # Draw statistics
         stats_start_y = separator_y + 15
-        line_height = self.stats_font.get_linesize() + 5
+        line_height = self.stats_font.get_linesize() + 3
         
         stats_items = [
             ("Search Depth", f"{self.ai_stats['depth']}"),
             ("Positions", f"{self.ai_stats['positions_evaluated']:,}"),
             ("Time", f"{self.ai_stats['evaluation_time']:.2f} sec"),
-            ("Positions/sec", f"{self.ai_stats['positions_per_second']:,}")
+            ("Positions/sec", f"{self.ai_stats['positions_per_second']:,}"),
+            ("TT Hit/Fill", f"{self.ai_stats['tt_hit_rate']:.0%} / {self.ai_stats['tt_fill']:.0%}"),
+            ("1st Move Cuts", f"{self.ai_stats['first_move_cutoff_rate']:.0%}")
         ]
         
         for i, (label, value) in enumerate(stats_items):
@@ -183,7 +197,7 @@ class StatusDisplay:
         current_time = pygame.time.get_ticks()
         elapsed = current_time - self.message_start_time
 
-        if elapsed > self.display_time and self.message_type not in ['checkmate', 'stalemate']:
+        if elapsed > self.display_time and self.message_type not in ['checkmate', 'stalemate', 'draw']:
             self.should_display = False
             self.current_message = ""
             return
@@ -308,7 +322,8 @@ class StatusDisplay:
             'normal': 'Game Status',
             'check': 'Check!',
             'checkmate': 'Checkmate!',
-            'stalemate': 'Stalemate'
+            'stalemate': 'Stalemate',
+            'draw': 'Draw'
         }
         return titles.get(self.message_type, 'Game Status')
 
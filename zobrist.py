@@ -0,0 +1,37 @@
+import random
+from bitboard import PIECE_TYPES, COLORS
+
+# Fixed seed so hashes are identical across runs and processes.
+_random = random.Random(20240601)
+
+PIECE_KEYS = {color: {piece_type: [_random.getrandbits(64) for _ in range(64)]
+                      for piece_type in PIECE_TYPES}
+              for color in COLORS}
+# a pawn that has not moved yet may still double step from its square
+DOUBLE_STEP_KEYS = [_random.getrandbits(64) for _ in range(64)]
+WHITE_TO_MOVE_KEY = _random.getrandbits(64)
+
+
+def piece_key(piece, square):
+    key = PIECE_KEYS[piece.color][piece.type][square]
+    if piece.type == 'pawn' and not piece.moved_once:
+        key ^= DOUBLE_STEP_KEYS[square]
+    return key
+
+
+def compute_pawn_hash(position):
+    # pawn placement only, the key of the pawn structure cache
+    value = 0
+    for square, piece in enumerate(position.squares):
+        if piece is not None and piece.type == 'pawn':
+            value ^= PIECE_KEYS[piece.color]['pawn'][square]
+    return value
+
+
+def compute_hash(position):
+    # full recompute, the reference for the incremental hash kept by Position
+    value = WHITE_TO_MOVE_KEY if position.turn == 'white' else 0
+    for square, piece in enumerate(position.squares):
+        if piece is not None:
+            value ^= piece_key(piece, square)
+    return value